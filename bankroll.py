@@ -0,0 +1,133 @@
+"""
+Players' chips kept in a SQLite database between games.
+
+A BankrollStore hands out TrackedPlayers loaded with their saved
+balance. Every change to a tracked player's chips is reported to the
+store as a delta. Deltas are added up per player in memory and
+written in one transaction once batch_size of them have come in, or
+when the store is flushed or closed, so the number of writes does
+not grow with the number of hands played.
+
+    with BankrollStore("bankroll.db") as store:
+        game = create_game(store=store, name="alice")
+        ...
+"""
+
+import sqlite3
+
+from blackjack import Player
+
+STARTING_CHIPS = 500
+
+
+class BankrollStore:
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 1000,
+        starting_chips: int = STARTING_CHIPS,
+    ) -> None:
+        """
+        Args:
+            path: the database file, ":memory:" for a throwaway store
+            batch_size: deltas recorded before they are written
+            starting_chips: the balance of a player seen for the first time
+        """
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS bankroll "
+            "(name TEXT PRIMARY KEY, chips INTEGER NOT NULL)"
+        )
+        self._db.commit()
+
+        self._batch_size = batch_size
+        self._starting_chips = starting_chips
+        self._pending: dict[str, int] = {}
+        self._recorded = 0
+        self.transactions = 0
+
+    def load(self, name: str) -> int:
+        """Returns the player's chips, with the deltas not written yet"""
+        row = self._db.execute(
+            "SELECT chips FROM bankroll WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            self._db.execute(
+                "INSERT INTO bankroll (name, chips) VALUES (?, ?)",
+                (name, self._starting_chips),
+            )
+            self._db.commit()
+            self.transactions += 1
+            chips = self._starting_chips
+        else:
+            chips = row[0]
+        return chips + self._pending.get(name, 0)
+
+    def player(self, name: str) -> "TrackedPlayer":
+        """Returns a player holding their saved chips"""
+        return TrackedPlayer(self, name)
+
+    def record(self, name: str, delta: int) -> None:
+        """adds delta to the player's chips, written with the next batch"""
+        pending = self._pending
+        pending[name] = pending.get(name, 0) + delta
+        self._recorded += 1
+        if self._recorded >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """writes every pending delta in one transaction"""
+        changes = [(delta, name) for name, delta in self._pending.items() if delta]
+        self._pending.clear()
+        self._recorded = 0
+        if not changes:
+            return
+
+        with self._db:
+            # players only recorded, never loaded, start from starting_chips
+            self._db.executemany(
+                "INSERT OR IGNORE INTO bankroll (name, chips) VALUES (?, ?)",
+                [(name, self._starting_chips) for _, name in changes],
+            )
+            self._db.executemany(
+                "UPDATE bankroll SET chips = chips + ? WHERE name = ?", changes
+            )
+        self.transactions += 1
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    def __enter__(self) -> "BankrollStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TrackedPlayer(Player):
+    """
+    A Player whose chip changes are recorded in a BankrollStore.
+
+    _chips is a property here, so payout, lose_bet, split_win,
+    split_lose and every other change to the chips is seen without
+    overriding them one by one.
+    """
+
+    def __init__(self, store: BankrollStore, name: str) -> None:
+        self._store = store
+        self._balance = store.load(name)
+        super().__init__([], name, self._balance)
+
+    @property
+    def _chips(self) -> int:
+        return self._balance
+
+    @_chips.setter
+    def _chips(self, chips: int) -> None:
+        delta = chips - self._balance
+        if delta:
+            self._store.record(self._name, delta)
+        self._balance = chips
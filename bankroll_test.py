@@ -0,0 +1,47 @@
+from bankroll import BankrollStore
+from blackjack import create_game
+from server import Session
+
+
+def test_new_players_start_with_500(tmp_path):
+    with BankrollStore(str(tmp_path / "bankroll.db")) as store:
+        assert store.load("alice") == 500
+        assert create_game(store=store, name="bob").get_player().get_chips() == 500
+
+
+def test_chips_are_saved_between_games(tmp_path):
+    path = str(tmp_path / "bankroll.db")
+    with BankrollStore(path) as store:
+        player = create_game(store=store, name="alice").get_player()
+        player.bet(100)
+        player.payout()
+        player.bet(50)
+        player.lose_bet()
+
+    with BankrollStore(path) as store:
+        assert store.player("alice").get_chips() == 550
+
+
+def test_deltas_are_written_in_batches(tmp_path):
+    with BankrollStore(str(tmp_path / "bankroll.db"), batch_size=100) as store:
+        player = store.player("alice")
+        start = store.transactions
+
+        for _ in range(1000):
+            player.add_chips(2)
+            player.reduce_chips(1)
+
+        assert store.transactions - start == 20
+        assert store.load("alice") == 1500
+
+
+def test_session_loads_saved_player(tmp_path):
+    path = str(tmp_path / "bankroll.db")
+    with BankrollStore(path) as store:
+        store.record("alice", 250)
+
+    with BankrollStore(path) as store:
+        session = Session(create_game(), store)
+
+        assert session.handle("PLAYER alice") == "CHIPS 750"
+        assert Session(create_game()).handle("PLAYER alice") == "ERR no bankroll store"
@@ -0,0 +1,168 @@
+"""
+Times the hot paths of the game and compares them with a saved baseline.
+
+    python benchmarks.py --save     records the baseline
+    python benchmarks.py            fails if a benchmark got slower than
+                                    the baseline by more than the threshold
+"""
+
+import json
+import sys
+import timeit
+from random import Random
+from typing import Callable
+
+from blackjack import BlackJackDeck, Player, Table
+from cards import Card, Deck
+from simulator import DealerStrategy
+
+BASELINE_PATH = "bench_baseline.json"
+THRESHOLD = 0.25
+
+
+def bench_deck_build() -> Callable[[], object]:
+    rng = Random(0)
+    return lambda: BlackJackDeck(rng)
+
+
+def bench_draw_card() -> Callable[[], object]:
+    deck = BlackJackDeck(Random(0))
+
+    def draw():
+        if deck.needs_reshuffle():
+            deck.reshuffle()
+        deck.draw_card()
+
+    return draw
+
+
+def bench_get_card_values() -> Callable[[], object]:
+    player = Player([Card(1, "Heart"), Card(5, "Club"), Card(12, "Spade")])
+    return player.get_card_values
+
+
+def bench_full_round() -> Callable[[], object]:
+    table = Table(Player([], "Player", 10**9), Player([]), BlackJackDeck(Random(0)))
+
+    def play():
+        table.player_bets(10)
+        table.initial_deal()
+        table.player_action("stand")
+        table.dealer_action()
+        table.compare_cards()
+        table.reset_table()
+
+    return play
+
+
+# a pair of 8s against 17, each split dealt a second card, the first hits
+SPLIT_CARDS = [Card(value, "") for value in (8, 10, 8, 7, 3, 10, 9)]
+
+
+def bench_split_resolution() -> Callable[[], object]:
+    def play():
+        deck = Deck()
+        deck.add_cards(SPLIT_CARDS)
+        table = Table(Player([]), Player([]), deck)
+        table.player_bets(10)
+        table.initial_deal()
+
+        splits = table.create_split()
+        table.split_action(splits[0], "hit")
+        table.split_dealer_action()
+        table.settle_splits()
+
+    return play
+
+
+def bench_snapshot_restore() -> Callable[[], object]:
+    table = Table(Player([], "Player", 10**9), Player([]), BlackJackDeck(Random(0)))
+    table.player_bets(10)
+    table.initial_deal()
+    state = table.snapshot()
+
+    def branch():
+        table.player_action("hit")
+        table.restore(state)
+
+    return branch
+
+
+def bench_play_rounds() -> Callable[[], object]:
+    table = Table(Player([], "Player", 10**12), Player([]), BlackJackDeck(Random(0)))
+    strategy = DealerStrategy()
+    # a hundred rounds a call
+    return lambda: table.play_rounds(100, strategy, 10)
+
+
+BENCHMARKS = {
+    "deck_build": bench_deck_build,
+    "draw_card": bench_draw_card,
+    "get_card_values": bench_get_card_values,
+    "full_round": bench_full_round,
+    "split_resolution": bench_split_resolution,
+    "snapshot_restore": bench_snapshot_restore,
+    "play_rounds": bench_play_rounds,
+}
+
+
+def run_benchmarks(repeat: int = 5) -> dict[str, float]:
+    """
+    Returns the best time per call of every benchmark in nanoseconds
+    """
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        timer = timeit.Timer(setup())
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat, number))
+        results[name] = best / number * 1e9
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Returns the names of benchmarks slower than baseline by more than threshold"""
+    return [
+        name
+        for name, time in results.items()
+        if name in baseline and time > baseline[name] * (1 + threshold)
+    ]
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", action="store_true", help="write a new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    results = run_benchmarks()
+
+    if args.save:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+
+    try:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        baseline = {}
+
+    for name, time in results.items():
+        line = f"{name:<20} {time:>12,.0f} ns"
+        if name in baseline:
+            line += f"  ({time / baseline[name] - 1:+.1%})"
+        print(line)
+
+    slower = compare(results, baseline, args.threshold)
+    if slower:
+        print(f"\nslower than baseline by more than {args.threshold:.0%}: {', '.join(slower)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,96 @@
-from typing import Literal
+from array import array
+from random import Random
+from typing import Callable, Literal
 from cards import Deck, Card
+from eventlog import DEALER_HAND, PLAYER_HAND, SPLIT_HAND, NullEventLog
+from outcomes import (
+    OUTCOME_NAMES,
+    Action,
+    Outcome,
+    parse_action,
+    BLACKJACK,
+    BUST,
+    COMPARE,
+    CONTINUE,
+    DEALER,
+    DEALER_ACTION,
+    INVALID,
+    PLAYER,
+    SPLIT,
+    SURRENDER,
+    TIED,
+)
+from profiling import PhaseProfiler
+from rules import DEFAULT_RULES, Rules
 
 
 class BlackJackDeck(Deck):
     """
-    creates a 6 deck shoe for blackjack gameplay.
-    Deck is shuffled when created
+    creates a shoe of the given number of decks for blackjack gameplay.
+    Deck is shuffled when created and the cut card placed
+    at the given penetration
+
+    Given a shoepool.ShoePool the shoe and every reshuffle come from
+    the pool, and decks is the pool's.
 
     Methods:
         __init__
         shuffle_deck
         draw_card
+        reshuffle
 
     """
 
-    def __init__(self) -> None:
-        super().__init__()
-        for _ in range(6):
+    def __init__(
+        self,
+        rng: Random | None = None,
+        penetration: float = 0.75,
+        decks: int = 6,
+        pool=None,
+    ) -> None:
+        super().__init__(rng)
+        if pool is not None:
+            decks = pool.decks
+        for _ in range(decks):
             self.add_64_cards()
 
-        self.shuffle_deck()
+        if pool is not None:
+            self.set_shoe_pool(pool)
+            self.reshuffle()
+        else:
+            self.shuffle_deck()
 
+        self.set_penetration(penetration)
 
-class Player:
-    def __init__(self, cards: list[Card], name: str = "", chips: int = 500) -> None:
+
+class Hand:
+    """
+    A hand of cards and the bet riding on it.
+    Used on its own for split hands.
+    """
+
+    __slots__ = ("_cards", "_name", "_bet", "_hard_total", "_aces", "_finished")
+
+    def __init__(self, cards: list[Card], name: str = "", bet: int = 0) -> None:
         """
-        Constructor method for Entity,
         Args:
-            cards: a list that stores the cards the entity holds
-            name: name of the entity
+            cards: a list that stores the cards the hand holds
+            name: name of the hand
+            bet: the chips riding on the hand
         """
         self._cards = cards
         self._name = name
+        self._bet = bet
+        # set on hands that may not take more cards, like split aces
+        self._finished = False
 
-        self._chips = chips
-        self._bet = 0
+        # running totals kept up to date by add_card and clear_cards
+        self._hard_total = 0
+        self._aces = 0
+        for card in cards:
+            self._hard_total += card.points
+            if card.value == 1:
+                self._aces += 1
 
     def get_cards(self) -> list[Card]:
         return self._cards
@@ -44,43 +100,105 @@ class Player:
 
     def get_card_values(self) -> int:
         """Returns the added up values of the entity's cards"""
+        # one ace counts as 11 when it does not bust the hand
+        if self._aces and self._hard_total <= 11:
+            return self._hard_total + 10
+        return self._hard_total
 
-        total_value = 0
-        for card in self._cards:
-            # sets face card values to 10
-            if card.value > 10:
-                value = 10
-            else:
-                value = card.value
+    def get_hard_total(self) -> int:
+        """Returns the added up values with every ace counted as 1"""
+        return self._hard_total
 
-            total_value += value
+    def is_soft(self) -> bool:
+        """True if an ace is being counted as 11"""
+        return self._aces > 0 and self._hard_total <= 11
 
-        # Turns Ace value to 1 if value is > 11
-        if "A" in map(repr, self._cards) and total_value <= 11:
-            total_value += 10
+    def is_pair(self) -> bool:
+        """True if the hand is two cards of the same value"""
+        cards = self._cards
+        return len(cards) == 2 and cards[0].points == cards[1].points
 
-        return total_value
+    def is_finished(self) -> bool:
+        return self._finished
 
-    def get_chips(self) -> int:
-        return self._chips
-
-    def double_chips(self):
-        self._chips *= 2
+    def finish(self) -> None:
+        """the hand may not take any more cards"""
+        self._finished = True
 
     def get_bet(self) -> int:
         return self._bet
 
+    def double_bet(self):
+        self._bet *= 2
+
+    def clear_bet(self) -> None:
+        """sets bet to 0"""
+        self._bet = 0
+
     def add_card(self, card: Card) -> None:
         """Gives the entity the passed card."""
         self._cards.append(card)
+        self._hard_total += card.points
+        if card.value == 1:
+            self._aces += 1
+
+    def remove_card(self) -> Card:
+        """Takes back the hand's last card"""
+        card = self._cards.pop()
+        self._hard_total -= card.points
+        if card.value == 1:
+            self._aces -= 1
+        return card
 
     def clear_cards(self) -> None:
         self._cards = []
+        self._hard_total = 0
+        self._aces = 0
+        self._finished = False
 
     def blackjack_check(self) -> bool:
-        if len(self._cards) == 2 and self.get_card_values() == 21:
-            return True
-        return False
+        return (
+            len(self._cards) == 2 and self._aces > 0 and self._hard_total == 11
+        )
+
+    def snapshot(self) -> tuple:
+        """Returns the hand's state as a tuple, to be given back to restore"""
+        return (
+            tuple(self._cards),
+            self._bet,
+            self._hard_total,
+            self._aces,
+            self._finished,
+        )
+
+    def restore(self, state: tuple) -> None:
+        cards, self._bet, self._hard_total, self._aces, self._finished = state
+        self._cards = list(cards)
+
+
+class Player(Hand):
+    def __init__(self, cards: list[Card], name: str = "", chips: int = 500) -> None:
+        """
+        Constructor method for Entity,
+        Args:
+            cards: a list that stores the cards the entity holds
+            name: name of the entity
+        """
+        super().__init__(cards, name)
+        self._chips = chips
+
+    def get_chips(self) -> int:
+        return self._chips
+
+    def double_chips(self):
+        self._chips *= 2
+
+    def snapshot(self) -> tuple:
+        return super().snapshot() + (self._chips,)
+
+    def restore(self, state: tuple) -> None:
+        super().restore(state[:-1])
+        self._chips = state[-1]
 
     def check_can_double_split(self) -> bool:
         if (self._chips - self._bet) < self._bet:
@@ -113,40 +231,72 @@ class Player:
     def add_chips(self, num: int):
         self._chips += num
 
-    def clear_bet(self) -> None:
-        """sets bet to 0"""
-        self._bet = 0
-
     def lose_bet(self):
         self._chips -= self._bet
         self.clear_bet()
 
-    def double_bet(self):
-        self._bet *= 2
-
-    def payout(self, blackjack: bool = False) -> None:
+    def payout(self, blackjack: bool = False, blackjack_payout: float = 1.5) -> None:
         """adds the bet amount to the players chips
         and clears the bet
-        if blackjack is true, will change the payout
+        if blackjack is true, blackjack_payout times the bet is added instead
         """
         if blackjack is True:
-            chips = self._bet * 1.5
-            self._chips += int(chips)
-
-        self._chips += self._bet
+            self._chips += int(self._bet * blackjack_payout)
+        else:
+            self._chips += self._bet
         self.clear_bet()
 
 
 class Table:
     """
     Handles all the interactions between player and dealer
+
+    Split hands are Hands kept in a stack, in the order they are played,
+    each with its own bet. A split hand can be split again until there
+    are max_split_hands hands.
+
+    The rules are read once, into attributes the hot paths use directly.
     """
 
-    def __init__(self, player: Player, dealer: Player, deck: Deck) -> None:
+    def __init__(
+        self, player: Player, dealer: Player, deck: Deck, rules: Rules = DEFAULT_RULES
+    ) -> None:
         self._player = player
         self._dealer = dealer
 
         self._deck = deck
+        self._splits: list[Hand] = []
+        self._log = NullEventLog()
+
+        self._rules = rules
+        self._hit_soft_17 = rules.hit_soft_17
+        self._double_after_split = rules.double_after_split
+        self._surrender = rules.surrender
+        self._blackjack_payout = rules.blackjack_payout
+        self._max_split_hands = rules.max_split_hands
+        self._split_aces_one_card = rules.split_aces_one_card
+        self._bind_handlers()
+
+    def _bind_handlers(self) -> None:
+        """
+        the handlers of each Action, indexed by its value,
+        bound again when methods are swapped on the instance
+        """
+        self._player_handlers = (
+            self.player_hit,
+            self._stand,
+            self._double,
+            self._split,
+            self._surrender_hand,
+        )
+        self._split_handlers = (
+            self.split_hit,
+            self._split_stand,
+            self._split_double,
+            self._split_split,
+            # split hands can not surrender
+            self._split_invalid,
+        )
 
     def get_player(self) -> Player:
         return self._player
@@ -157,14 +307,90 @@ class Table:
     def get_deck(self) -> Deck:
         return self._deck
 
-    def draw_card(self, player: Player) -> None:
-        player.add_card(self._deck.draw_card())
+    def get_rules(self) -> Rules:
+        return self._rules
+
+    def set_deck(self, deck: Deck) -> None:
+        """replaces the shoe, used when the current one runs out"""
+        self._deck = deck
+
+    def set_event_log(self, log: NullEventLog) -> None:
+        """records the table's deals, actions and settlements to log"""
+        self._log = log
+
+    def set_profiler(self, profiler: PhaseProfiler | None) -> None:
+        """
+        times the phases of every round with profiler,
+        None puts back the untimed methods
+        """
+        PhaseProfiler.uninstrument(self)
+        if profiler is not None:
+            profiler.instrument(self)
+        self._bind_handlers()
+
+    def get_splits(self) -> list[Hand]:
+        return self._splits
+
+    def snapshot(self) -> tuple:
+        """
+        Returns the state of the round: the player, dealer, split hands,
+        bets and the deck's cursor, to be given back to restore.
+
+        Hands are kept as tuples and the deck's cards are shared until
+        it is shuffled, so a position can be branched from many times.
+        The event log is not part of the state.
+        """
+        return (
+            self._player.snapshot(),
+            self._dealer.snapshot(),
+            tuple((split.get_name(), split.snapshot()) for split in self._splits),
+            self._deck.snapshot(),
+        )
+
+    def restore(self, state: tuple) -> None:
+        """
+        puts the table back to a state returned by snapshot,
+        split hands are new objects, get them again with get_splits
+        """
+        player, dealer, splits, deck = state
+        self._player.restore(player)
+        self._dealer.restore(dealer)
+        self._deck.restore(deck)
+
+        self._splits = []
+        for name, split_state in splits:
+            split = Hand([], name)
+            split.restore(split_state)
+            self._splits.append(split)
+
+    def hand_number(self, hand: Hand) -> int:
+        """the number identifying the hand in the event log"""
+        if hand is self._player:
+            return PLAYER_HAND
+        elif hand is self._dealer:
+            return DEALER_HAND
+        elif hand in self._splits:
+            return SPLIT_HAND + self._splits.index(hand)
+        return SPLIT_HAND
+
+    def draw_card(self, player: Hand) -> None:
+        card = self._deck.draw_card()
+        player.add_card(card)
+        self._log.deal(self.hand_number(player), card)
 
     def player_draw_card(self) -> None:
-        self._player.add_card(self._deck.draw_card())
+        card = self._deck.draw_card()
+        self._player.add_card(card)
+        self._log.deal(PLAYER_HAND, card)
 
     def dealer_draw_card(self) -> None:
-        self._dealer.add_card(self._deck.draw_card())
+        card = self._deck.draw_card()
+        self._dealer.add_card(card)
+        self._log.deal(DEALER_HAND, card)
+
+    def log_dealer_card(self, card: Card) -> None:
+        """logs a card another table dealt the dealer this table shares"""
+        self._log.deal(DEALER_HAND, card)
 
     def player_bets(self, bet: int) -> bool:
         return self._player.bet(bet)
@@ -175,7 +401,11 @@ class Table:
         deals two cards to the player and dealer
 
         if returns blackjack if player got blackjack
+        reshuffles the shoe first if the cut card has been reached
         """
+        if self._deck.needs_reshuffle():
+            self._deck.reshuffle()
+
         self.player_draw_card()
         self.dealer_draw_card()
         self.player_draw_card()
@@ -184,128 +414,186 @@ class Table:
         if self.get_player().blackjack_check():
             return "blackjack"
 
-    def player_hit(self) -> None | Literal["bust", "dealer_action"]:
+    def player_hit(self) -> Outcome:
         """
         Returns:
-            "bust"
-            "dealer_action"
-            None
+            BUST
+            DEALER_ACTION on 21
+            CONTINUE
         """
         self.player_draw_card()
+        value = self._player.get_card_values()
 
-        if self._player.get_card_values() > 21:
-            return "bust"
+        if value > 21:
+            return BUST
 
-        elif self._player.get_card_values() == 21:
-            return "dealer_action"
+        elif value == 21:
+            return DEALER_ACTION
 
-        return None
+        return CONTINUE
 
-    def split_hit(self, split: Player) -> None | Literal["bust", "dealer_action"]:
-        """
-        Returns:
-            "bust"
-            "dealer_action"
-            None
-        """
+    def split_hit(self, split: Hand) -> Outcome:
+        """returns as player_hit"""
         self.draw_card(split)
+        value = split.get_card_values()
 
-        if split.get_card_values() > 21:
-            return "bust"
+        if value > 21:
+            return BUST
 
-        elif split.get_card_values() == 21:
-            return "dealer_action"
+        elif value == 21:
+            return DEALER_ACTION
 
-        return None
+        return CONTINUE
 
-    def player_double(self) -> None | Literal["dealer_action", "bust"]:
+    def player_double(self) -> Outcome:
         """
         Returns:
-            "bust"
-            "dealer_action"
+            BUST
+            DEALER_ACTION
         """
         self._player.double_bet()
-        hit_result = self.player_hit()
+        if self.player_hit() is BUST:
+            return BUST
+        return DEALER_ACTION
+
+    def split_double(self, split: Hand) -> Outcome:
+        split.double_bet()
+        if self.split_hit(split) is BUST:
+            return BUST
+        return DEALER_ACTION
+
+    def committed_chips(self) -> int:
+        """the chips the player has riding on the table"""
+        if self._splits:
+            return sum(split.get_bet() for split in self._splits)
+        return self._player.get_bet()
+
+    def can_cover(self, bet: int) -> bool:
+        """True if the player has the chips to add bet to the table"""
+        return self._player.get_chips() - self.committed_chips() >= bet
+
+    def can_split(self, hand: Hand) -> bool:
+        """True if the split hand may be split again"""
+        return (
+            hand.is_pair()
+            and not hand.is_finished()
+            and len(self._splits) < self._max_split_hands
+            and self.can_cover(hand.get_bet())
+        )
+
+    def _deal_split(self, hand: Hand) -> None:
+        """gives a newly split hand its second card"""
+        self.draw_card(hand)
+        if self._split_aces_one_card and hand.get_cards()[0].value == 1:
+            hand.finish()
+
+    def create_split(self) -> list[Hand]:
+        """
+        splits the player's pair into two hands with the player's bet
+        each, each dealt a second card.
 
-        if hit_result is None:
-            return "dealer_action"
+        returns the split hands, the list grows if a hand is split again
+        """
+        cards = self.get_player().get_cards()
+        bet = self._player.get_bet()
+        self._splits = [
+            Hand([cards[0]], "split 1", bet),
+            Hand([cards[1]], "split 2", bet),
+        ]
+        for split in self._splits:
+            self._deal_split(split)
+        return self._splits
 
-        return hit_result
+    def resplit(self, split: Hand) -> None:
+        """
+        splits a split hand again, the new hand is played next
+        """
+        index = self._splits.index(split)
+        new_split = Hand([split.remove_card()], f"split {len(self._splits) + 1}", split.get_bet())
+        self._splits.insert(index + 1, new_split)
 
-    def split_double(self, split: Player):
-        split.double_chips()
-        hit_result = self.split_hit(split)
+        self._deal_split(split)
+        self._deal_split(new_split)
 
-        if hit_result is None:
-            return "dealer_action"
+    def split_action(
+        self, split: Hand, action: str
+    ) -> None | Literal["bust", "dealer_action", "invalid", "split"]:
+        """
+        returns as player_action
+        "split" means the hand was split again and is to be played on
+        """
+        return OUTCOME_NAMES[self.split_act(split, action)]
 
-        return hit_result
+    def split_act(self, split: Hand, action: Action | str) -> Outcome:
+        """
+        split_action returning an Outcome,
+        SPLIT means the hand was split again and is to be played on
+        """
+        self._log.action(self.hand_number(split), action)
 
-    def create_split(self):
-        return [
-            Player(
-                [self.get_player().get_cards()[0]], "split 1", self._player.get_bet()
-            ),
-            Player(
-                [self.get_player().get_cards()[1]], "split 2", self._player.get_bet()
-            ),
-        ]
+        if split.is_finished():
+            return DEALER_ACTION
 
-    def split_action(
-        self, split: Player, action: str
-    ) -> None | Literal["bust", "dealer_action", "invalid"]:
-        if action == "hit":
-            return self.split_hit(split)
+        action = parse_action(action)
+        if action is None:
+            return INVALID
+        return self._split_handlers[action](split)
 
-        elif action == "stand":
-            return "dealer_action"
+    def _split_stand(self, split: Hand) -> Outcome:
+        return DEALER_ACTION
 
-        elif action == "double":
-            if not self.get_player().check_can_double_split():
-                return "invalid"
-            return self.split_double(split)
+    def _split_double(self, split: Hand) -> Outcome:
+        if not self._double_after_split or not self.can_cover(split.get_bet()):
+            return INVALID
+        return self.split_double(split)
 
-        # elif action == "split":
-        #     if not self.get_player().check_can_double_split():
-        #         return "invalid"
-        #     return "split"
-        else:
-            return "invalid"
+    def _split_split(self, split: Hand) -> Outcome:
+        if not self.can_split(split):
+            return INVALID
+        self.resplit(split)
+        return SPLIT
+
+    def _split_invalid(self, split: Hand) -> Outcome:
+        return INVALID
 
-    def dealer_action(self) -> None | Literal["player", "dealer", "tied", "compare"]:
+    def dealer_action(self) -> Literal["player", "compare"]:
         """
+        plays the dealer's hand out
         Return:
             "compare"
-            "tied"
-            "player"
-            "dealer"
+            "player" if the dealer went bust
         """
-        value = self._dealer.get_card_values()
-
-        if value < 17:
-            self.dealer_draw_card()
-            return self.dealer_action()
-
-        elif value > 21:
-            return "player"
-
-        elif 17 <= value <= 21:
-            return "compare"
+        return OUTCOME_NAMES[self.play_dealer()[1]]
 
-        else:
-            raise ValueError(f"Invalid dealer card value: {value}")
-
-    def split_dealer_action(self) -> None | Literal["compare", "player"]:
-        value = self._dealer.get_card_values()
-        if value < 17:
-            self.dealer_draw_card()
-            return self.split_dealer_action()
+    def split_dealer_action(self) -> Literal["compare", "player"]:
+        """dealer_action for a round with split hands"""
+        return OUTCOME_NAMES[self.play_dealer()[1]]
 
-        elif 17 <= value <= 21:
-            return "compare"
+    def play_dealer(self) -> tuple[int, Outcome]:
+        """
+        Draws the dealer's cards in one loop until the dealer stands,
+        by the rules, or goes bust.
 
-        elif value > 21:
-            return "player"
+        Returns:
+            the dealer's final total and
+            PLAYER if the dealer went bust, COMPARE otherwise
+        """
+        dealer = self._dealer
+        draw_card = self._deck.draw_card
+        add_card = dealer.add_card
+        deal = self._log.deal
+        hit_soft_17 = self._hit_soft_17
+
+        value = dealer.get_card_values()
+        while value < 17 or (value == 17 and hit_soft_17 and dealer.is_soft()):
+            card = draw_card()
+            add_card(card)
+            deal(DEALER_HAND, card)
+            value = dealer.get_card_values()
+
+        if value > 21:
+            return value, PLAYER
+        return value, COMPARE
 
     def compare_cards(self) -> str | None:
         """
@@ -313,30 +601,51 @@ class Table:
         Return:
             "tied", "player", "dealer"
         """
+        return OUTCOME_NAMES[self.compare()]
+
+    def compare(self) -> Outcome:
+        """
+        compare_cards returning an Outcome,
+        TIED, PLAYER or DEALER
+        """
         player_val = self._player.get_card_values()
         dealer_val = self._dealer.get_card_values()
+        bet = self._player.get_bet()
 
-        if player_val == dealer_val:
-            return "tied"
+        # a dealer blackjack beats a 21 of more cards
+        if player_val == dealer_val and not (
+            dealer_val == 21 and self._dealer.blackjack_check()
+        ):
+            self._player.clear_bet()
+            self._log.settle(PLAYER_HAND, "tied", 0)
+            return TIED
 
         elif player_val > dealer_val:
             self._player.payout()
-            return "player"
+            self._log.settle(PLAYER_HAND, "player", bet)
+            return PLAYER
 
-        elif dealer_val > player_val:
+        else:
             self._player.lose_bet()
-            return "dealer"
+            self._log.settle(PLAYER_HAND, "dealer", -bet)
+            return DEALER
 
-    def split_compare_cards(self, split: Player) -> Literal["tied", "player", "dealer"]:
+    def split_compare_cards(self, split: Hand) -> Literal["tied", "player", "dealer"]:
         """
         Returns whoever has the higher card values or tied
+        the split wins if the dealer went bust
         Return:
             "tied", "player", "dealer"
         """
         split_val = split.get_card_values()
         dealer_val = self._dealer.get_card_values()
 
-        if split_val == dealer_val:
+        if dealer_val > 21:
+            return "player"
+        elif split_val == dealer_val:
+            # a dealer blackjack beats a 21 of more cards
+            if dealer_val == 21 and self._dealer.blackjack_check():
+                return "dealer"
             return "tied"
         elif split_val > dealer_val:
             return "player"
@@ -345,7 +654,7 @@ class Table:
         else:
             raise ValueError
 
-    def collect_split_results(self, splits: list[Player]) -> list[Literal["bust", "player", "dealer", "tied"]]:
+    def collect_split_results(self, splits: list[Hand]) -> list[Literal["bust", "player", "dealer", "tied"]]:
         split_results = []
         for split in splits:
             if split.get_card_values() > 21:
@@ -356,8 +665,10 @@ class Table:
         return split_results
 
     def player_action(
-        self, action: str | Literal["hit", "stand", "double", "split"]
-    ) -> None | Literal["dealer_action", "bust", "invalid", "split", "blackjack"]:
+        self, action: str | Literal["hit", "stand", "double", "split", "surrender"]
+    ) -> None | Literal[
+        "dealer_action", "bust", "invalid", "split", "blackjack", "surrender"
+    ]:
         """
         returns the result of the player action:
 
@@ -365,31 +676,231 @@ class Table:
         if dealer_action then dealer_action is to be called
         if split then create_splits should be called and split_action should be used for the splits
         if bust then dealer action should be called then player_lose
+        if surrender then player_surrender should be called
         """
-        if self.get_player().blackjack_check():
-            return "blackjack"
+        return OUTCOME_NAMES[self.act(action)]
 
-        elif action == "hit":
-            return self.player_hit()
+    def act(self, action: Action | str) -> Outcome:
+        """
+        player_action returning an Outcome,
+        CONTINUE means act is to be called again
+        """
+        self._log.action(PLAYER_HAND, action)
 
-        elif action == "stand":
-            return "dealer_action"
+        if self._player.blackjack_check():
+            return BLACKJACK
 
-        elif action == "double":
-            if not self.get_player().check_can_double_split():
-                return "invalid"
-            return self.player_double()
+        action = parse_action(action)
+        if action is None:
+            return INVALID
+        return self._player_handlers[action]()
 
-        elif action == "split":
-            if (
-                not self.get_player().check_can_double_split()
-                or not self.check_splitable()
-            ):
-                return "invalid"
-            return "split"
+    def _stand(self) -> Outcome:
+        return DEALER_ACTION
 
-        else:
-            return "invalid"
+    def _double(self) -> Outcome:
+        if not self._player.check_can_double_split():
+            return INVALID
+        return self.player_double()
+
+    def _split(self) -> Outcome:
+        if not self._player.check_can_double_split() or not self.check_splitable():
+            return INVALID
+        return SPLIT
+
+    def _surrender_hand(self) -> Outcome:
+        if not self._surrender or len(self._player.get_cards()) != 2:
+            return INVALID
+        return SURRENDER
+
+    def strategy_action(
+        self, strategy
+    ) -> None | Literal["dealer_action", "bust", "split", "blackjack", "surrender"]:
+        """
+        plays the action strategy decides for the player's hand,
+        strategy is anything with a decide method like simulator.Strategy
+
+        a refused split is replayed as the strategy's unsplit play,
+        a refused double or surrender as the strategy's fallback for it
+        returns as player_action
+        """
+        return OUTCOME_NAMES[self.strategy_act(strategy)]
+
+    def strategy_act(self, strategy) -> Outcome:
+        """strategy_action returning an Outcome"""
+        player = self._player
+        dealer_card = self._dealer.get_cards()[0]
+        can_split = len(player.get_cards()) == 2 and self.check_splitable()
+
+        action = strategy.decide(player, dealer_card, can_split)
+        return self._play_decision(strategy, action, dealer_card, can_split)
+
+    def _play_decision(
+        self, strategy, action: Action | str, dealer_card: Card, can_split: bool
+    ) -> Outcome:
+        """plays the strategy's action, falling back as strategy_action says"""
+        outcome = self.act(action)
+        if outcome is INVALID:
+            outcome = self._play_refused(strategy, action, dealer_card, can_split)
+        return outcome
+
+    def _play_refused(
+        self, strategy, action: Action | str, dealer_card: Card, can_split: bool
+    ) -> Outcome:
+        """plays on after the table refused the strategy's action"""
+        player = self._player
+        if parse_action(action) is Action.SPLIT:
+            can_split = False
+            action = strategy.decide(player, dealer_card, False)
+            outcome = self.act(action)
+            if outcome is not INVALID:
+                return outcome
+
+        outcome = self.act(strategy.fallback(player, dealer_card, can_split, action))
+        if outcome is INVALID:
+            outcome = self.act(Action.HIT)
+        return outcome
+
+    def play_rounds(
+        self, n: int, strategy, bet_policy: int | Callable[["Table"], int] = 10
+    ) -> "RoundResults":
+        """
+        Plays n rounds with strategy making every decision, in one loop
+        that hits and stands without going through player_action.
+        Rounds are played as simulator.Simulator plays them.
+
+        Stops early at a bet that is not positive or that the player
+        can not cover.
+
+        Args:
+            bet_policy: the bet of every round, or a function
+                of the table returning the next bet
+        """
+        player = self._player
+        deck = self._deck
+        play_round = self.play_round
+        fixed_bet = None if callable(bet_policy) else bet_policy
+
+        results = RoundResults()
+        outcomes = results.outcomes
+        nets = results.net
+        cards_used = results.cards_used
+
+        for _ in range(n):
+            bet = fixed_bet if fixed_bet is not None else bet_policy(self)
+            if bet <= 0 or not player.bet(bet):
+                break
+
+            chips = player.get_chips()
+            if deck.needs_reshuffle():
+                deck.reshuffle()
+            drawn = deck.cards_drawn()
+
+            outcomes.append(play_round(strategy))
+            nets.append(player.get_chips() - chips)
+            cards_used.append(deck.cards_drawn() - drawn)
+
+        return results
+
+    def play_round(self, strategy) -> Outcome:
+        """
+        Plays one round with the bet already placed and strategy making
+        every decision, the player's actions are dispatched straight to
+        their handlers.
+
+        Returns:
+            BLACKJACK, SPLIT, SURRENDER or the final Outcome of the hand
+        """
+        player = self._player
+        dealer = self._dealer
+        log = self._log
+
+        if self.initial_deal() == "blackjack":
+            self.play_dealer()
+            if dealer.blackjack_check():
+                self.push()
+                return TIED
+            self.player_blackjack_win()
+            return BLACKJACK
+
+        dealer_card = dealer.get_cards()[0]
+        handlers = self._player_handlers
+        while True:
+            can_split = len(player.get_cards()) == 2 and self.check_splitable()
+            decision = strategy.decide(player, dealer_card, can_split)
+            action = parse_action(decision)
+
+            if action is None:
+                outcome = self._play_decision(strategy, decision, dealer_card, can_split)
+            else:
+                log.action(PLAYER_HAND, decision)
+                outcome = handlers[action]()
+                if outcome is INVALID:
+                    outcome = self._play_refused(
+                        strategy, decision, dealer_card, can_split
+                    )
+
+            if outcome is CONTINUE:
+                continue
+            elif outcome is BUST:
+                self.player_lose()
+                return BUST
+            elif outcome is SPLIT:
+                self.play_splits(strategy)
+                return SPLIT
+            elif outcome is SURRENDER:
+                self.player_surrender()
+                return SURRENDER
+            break
+
+        if self.play_dealer()[1] is PLAYER:
+            self.player_win()
+            return PLAYER
+
+        outcome = self.compare()
+        self.reset_table()
+        return outcome
+
+    def play_splits(self, strategy) -> None:
+        """plays every split hand with strategy and settles them"""
+        splits = self.create_split()
+        # hands split again are added to splits while it is walked
+        for split in splits:
+            outcome = CONTINUE
+            while outcome is CONTINUE or outcome is SPLIT:
+                outcome = self.split_strategy_act(split, strategy)
+
+        self.split_dealer_action()
+        self.settle_splits()
+        self.reset_table()
+
+    def split_strategy_action(
+        self, split: Hand, strategy
+    ) -> None | Literal["bust", "dealer_action", "split"]:
+        """strategy_action for a split"""
+        return OUTCOME_NAMES[self.split_strategy_act(split, strategy)]
+
+    def split_strategy_act(self, split: Hand, strategy) -> Outcome:
+        """split_strategy_action returning an Outcome"""
+        dealer_card = self._dealer.get_cards()[0]
+        can_split = self.can_split(split)
+        action = strategy.decide(split, dealer_card, can_split)
+        outcome = self.split_act(split, action)
+        if outcome is not INVALID:
+            return outcome
+
+        if parse_action(action) is Action.SPLIT:
+            can_split = False
+            action = strategy.decide(split, dealer_card, False)
+            outcome = self.split_act(split, action)
+            if outcome is not INVALID:
+                return outcome
+
+        fallback = strategy.fallback(split, dealer_card, can_split, action)
+        outcome = self.split_act(split, fallback)
+        if outcome is INVALID:
+            outcome = self.split_act(split, Action.HIT)
+        return outcome
 
     def reset_table(self) -> None:
         """
@@ -398,40 +909,113 @@ class Table:
         clears dealer's bet
         """
         self._dealer.clear_cards()
+        self.end_round()
+
+    def end_round(self) -> None:
+        """
+        clears the player's hand, bet and splits and logs the end of
+        the round, leaving the dealer's cards to a table sharing them
+        """
         self._player.clear_cards()
         self._player.clear_bet()
+        self._splits = []
+        self._log.end_round(self._player.get_chips())
 
     def player_blackjack_win(self) -> None:
-        self._player.payout(True)
+        self.settle_blackjack()
         self.reset_table()
 
     def player_win(self) -> None:
         """
         player wins their bet and table is reset
         """
-        self._player.payout()
+        self.settle_win()
+        self.reset_table()
+
+    def player_surrender(self) -> None:
+        """
+        player gives up half their bet and table is reset
+        """
+        self.settle_surrender()
         self.reset_table()
 
     def player_lose(self) -> None:
         """
         player loses their bet and table is reset
         """
-        self._player.lose_bet()
+        self.settle_lose()
         self.reset_table()
 
-    def split_lose(self, split: Player):
-        self._player.reduce_chips(split.get_chips())
-
-    def split_win(self, split: Player):
-        self._player.add_chips(split.get_chips())
-
     def push(self):
+        self.settle_push()
         self.reset_table()
 
+    # the settle methods pay or take the player's bet and log it,
+    # the table is left to be reset
+
+    def settle_blackjack(self) -> None:
+        chips = self._player.get_chips()
+        self._player.payout(True, self._blackjack_payout)
+        self._log.settle(PLAYER_HAND, "blackjack", self._player.get_chips() - chips)
+
+    def settle_win(self) -> None:
+        bet = self._player.get_bet()
+        self._player.payout()
+        # compare_cards has already settled the bet when it decided the round
+        if bet:
+            self._log.settle(PLAYER_HAND, "player", bet)
+
+    def settle_surrender(self) -> None:
+        lost = self._player.get_bet() // 2
+        self._player.reduce_chips(lost)
+        self._player.clear_bet()
+        self._log.settle(PLAYER_HAND, "surrender", -lost)
+
+    def settle_lose(self) -> None:
+        bet = self._player.get_bet()
+        self._player.lose_bet()
+        if bet:
+            result = "bust" if self._player.get_card_values() > 21 else "dealer"
+            self._log.settle(PLAYER_HAND, result, -bet)
+
+    def settle_push(self) -> None:
+        if self._player.get_bet():
+            self._log.settle(PLAYER_HAND, "tied", 0)
+        self._player.clear_bet()
+
+    def split_lose(self, split: Hand):
+        self._player.reduce_chips(split.get_bet())
+        result = "bust" if split.get_card_values() > 21 else "dealer"
+        self._log.settle(self.hand_number(split), result, -split.get_bet())
+
+    def split_win(self, split: Hand):
+        self._player.add_chips(split.get_bet())
+        self._log.settle(self.hand_number(split), "player", split.get_bet())
+
+    def settle_splits(self) -> list[Literal["bust", "player", "dealer", "tied"]]:
+        """
+        pays or takes the bet of every split hand against the dealer's
+        hand in one pass, the table is left to be reset
+
+        returns the result of each split
+        """
+        results = self.collect_split_results(self._splits)
+        for split, result in zip(self._splits, results):
+            if result == "player":
+                self.split_win(split)
+            elif result == "tied":
+                self._log.settle(self.hand_number(split), "tied", 0)
+            else:
+                self.split_lose(split)
+
+        return results
+
     def check_splitable(self) -> bool:
         """
         True if can split
         """
+        if self._max_split_hands < 2:
+            return False
         player = self.get_player()
         card_1 = player.get_cards()[0]
         card_2 = player.get_cards()[1]
@@ -443,16 +1027,188 @@ class Table:
 
         return False
 
+class RoundResults:
+    """
+    The rounds played by Table.play_rounds, one column per field,
+    each an array.array so it can be handed to numpy or written out
+    through the buffer protocol without copying.
+
+    Attributes:
+        outcomes: the Outcome of each round, PLAYER to SPLIT
+        net: chips won (positive) or lost (negative) in each round
+        cards_used: cards drawn from the shoe in each round
+    """
+
+    __slots__ = ("outcomes", "net", "cards_used")
+
+    def __init__(self) -> None:
+        self.outcomes = array("B")
+        self.net = array("q")
+        self.cards_used = array("H")
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+
+class MultiSeatTable:
+    """
+    Up to seven players sharing one shoe and one dealer.
+
+    Every seat is a Table over the shared dealer and deck, so a seat's
+    player_action, split_action etc. work as they do on a single Table.
+    Cards are dealt round robin, the dealer plays once and every seat
+    is settled in one pass.
+
+    Each seat's event log sees the seat's cards, every dealer card and
+    the seat's settlements, as if it were playing a Table of its own.
+    """
+
+    MAX_SEATS = 7
+
+    def __init__(
+        self,
+        players: list[Player],
+        dealer: Player,
+        deck: Deck,
+        rules: Rules = DEFAULT_RULES,
+    ) -> None:
+        if not 1 <= len(players) <= self.MAX_SEATS:
+            raise ValueError(f"Invalid number of seats: {len(players)}")
+
+        self._dealer = dealer
+        self._deck = deck
+        self._seats = [Table(player, dealer, deck, rules) for player in players]
+        self._split_seats: set[int] = set()
+        self._surrendered_seats: set[int] = set()
+
+    def get_seats(self) -> list[Table]:
+        return self._seats
+
+    def get_seat(self, seat: int) -> Table:
+        return self._seats[seat]
+
+    def get_dealer(self) -> Player:
+        return self._dealer
+
+    def get_deck(self) -> Deck:
+        return self._deck
+
+    def initial_deal(self) -> list[None | Literal["blackjack"]]:
+        """
+        deals two cards to every seat and the dealer, one at a time
+
+        returns "blackjack" or None for each seat
+        """
+        if self._deck.needs_reshuffle():
+            self._deck.reshuffle()
+
+        for _ in range(2):
+            for seat in self._seats:
+                seat.player_draw_card()
+            self._dealer_draw_card()
+
+        return [
+            "blackjack" if seat.get_player().blackjack_check() else None
+            for seat in self._seats
+        ]
+
+    def _dealer_draw_card(self) -> None:
+        """deals the dealer a card, logged by every seat"""
+        card = self._deck.draw_card()
+        self._dealer.add_card(card)
+        for seat in self._seats:
+            seat.log_dealer_card(card)
+
+    def player_action(self, seat: int, action: str):
+        """the result of the action as returned by Table.player_action"""
+        return self._seats[seat].player_action(action)
+
+    def create_split(self, seat: int) -> list[Hand]:
+        """splits the seat's hand, the splits are settled by settle"""
+        self._split_seats.add(seat)
+        return self._seats[seat].create_split()
+
+    def surrender(self, seat: int) -> None:
+        """the seat gives up half its bet when the table is settled"""
+        self._surrendered_seats.add(seat)
+
+    def dealer_action(self) -> Literal["player", "compare"]:
+        """plays the dealer's hand once for every seat"""
+        result = self._seats[0].dealer_action()
+
+        # the first seat logged the dealer's hits as it played them
+        hits = self._dealer.get_cards()[2:]
+        for seat in self._seats[1:]:
+            for card in hits:
+                seat.log_dealer_card(card)
+
+        return result
+
+    def settle(
+        self,
+    ) -> list[list[Literal["bust", "blackjack", "player", "dealer", "tied", "surrender"]]]:
+        """
+        Pays or takes every seat's bet and clears the table.
+
+        Returns the result of each hand at each seat,
+        a seat that split has one result per split.
+        """
+        dealer_value = self._dealer.get_card_values()
+        dealer_blackjack = self._dealer.blackjack_check()
+
+        results = []
+        for i, seat in enumerate(self._seats):
+            player = seat.get_player()
+
+            if i in self._split_seats:
+                results.append(seat.settle_splits())
+
+            elif i in self._surrendered_seats:
+                seat.settle_surrender()
+                results.append(["surrender"])
+
+            elif player.get_card_values() > 21:
+                seat.settle_lose()
+                results.append(["bust"])
+
+            elif player.blackjack_check():
+                if dealer_blackjack:
+                    seat.settle_push()
+                    results.append(["tied"])
+                else:
+                    seat.settle_blackjack()
+                    results.append(["blackjack"])
+
+            elif dealer_value > 21:
+                seat.settle_win()
+                results.append(["player"])
+
+            else:
+                results.append([seat.compare_cards()])
+
+            seat.end_round()
+
+        self._split_seats.clear()
+        self._surrendered_seats.clear()
+        self._dealer.clear_cards()
+        return results
+
+
 class View:
     def __init__(self, game: Table) -> None:
         self.game = game
         self.splits = []
 
+        if game.get_rules().surrender:
+            self._action_prompt = "Player action (hit, stand, double, split, surrender): "
+        else:
+            self._action_prompt = "Player action (hit, stand, double, split): "
+
     def round_start(self):
         print("ROUND START")
         print("----------\n")
 
-    def display_cards(self, entity: Player, hide_second_card: bool = False):
+    def display_cards(self, entity: Hand, hide_second_card: bool = False):
         value = entity.get_card_values()
 
         print(f"\n{entity.get_name()} cards:")
@@ -495,7 +1251,7 @@ class View:
                 return
 
         while True:
-            action = input("Player action (hit, stand, double, split): ")
+            action = input(self._action_prompt)
             action_result = game.player_action(action)
 
             if action_result == "invalid":
@@ -522,6 +1278,10 @@ class View:
             return
         elif action_result == "split":
             return self.split_loop()
+        elif action_result == "surrender":
+            print("SURRENDER")
+            self.game.player_surrender()
+            return
         else:
             raise ValueError
 
@@ -547,27 +1307,23 @@ class View:
     def split_loop(self):
         splits = self.game.create_split()
 
+        # hands split again are added to splits while it is walked
         for split in splits:
             self.split_ask_player_action(split)
 
         self.game.split_dealer_action()
         self.display_cards(self.game.get_dealer())
 
-        split_results = self.game.collect_split_results(splits)
+        for i, result in enumerate(self.game.settle_splits()):
+            print(f"Split {i + 1}: {result}")
 
-        for i, result in enumerate(split_results):
-            print(f"Split {i}: {result}")
-            if result == "dealer":
-                self.game.split_lose(splits[i])
-            elif result == "player":
-                self.game.split_win(splits[i])
-            elif result == "tied":
-                pass
-            elif result == "bust":
-                self.game.split_lose(splits[i])
+        self.game.reset_table()
 
-    def split_ask_player_action(self, split: Player):
+    def split_ask_player_action(self, split: Hand):
         self.display_cards(split)
+        if split.is_finished():
+            return "dealer_action"
+
         while True:
             action = input("Player action (hit, stand, double, split): ")
             action_result = self.game.split_action(split, action)
@@ -576,7 +1332,7 @@ class View:
                 continue
 
             # action result is to recall
-            elif action_result is None:
+            elif action_result is None or action_result == "split":
                 self.display_cards(split)
                 continue
 
@@ -624,12 +1380,29 @@ class View:
                 break
 
 
-def create_game() -> Table:
-    player = Player([], "Player")
+def create_game(
+    rules: Rules = DEFAULT_RULES, store=None, name: str = "Player", pool=None
+) -> Table:
+    """
+    Args:
+        store: a bankroll.BankrollStore the player's chips are loaded
+            from and saved to, the player starts with 500 if not given
+        name: the player's name in the store
+        pool: a shoepool.ShoePool of rules.decks decks the shoe is
+            dealt from, shuffled in place if not given
+    """
+    player = Player([], name) if store is None else store.player(name)
     dealer = Player([], "Dealer")
-    deck = BlackJackDeck()
-
-    game = Table(player, dealer, deck)
+    if pool is None:
+        deck = BlackJackDeck(decks=rules.decks)
+    else:
+        if pool.decks != rules.decks:
+            raise ValueError(
+                f"Shoe pool of {pool.decks} decks for rules of {rules.decks}"
+            )
+        deck = BlackJackDeck(pool=pool)
+
+    game = Table(player, dealer, deck, rules)
     return game
 
 
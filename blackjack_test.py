@@ -1,7 +1,18 @@
+from random import Random
+
 import pytest
 
-from blackjack import BlackJackDeck, Player, create_game, Table
+from blackjack import (
+    BlackJackDeck,
+    MultiSeatTable,
+    Player,
+    Table,
+    create_game,
+)
 from cards import Card
+from eventlog import ACTION_CODES, DEALER_HAND, PLAYER_HAND, RESULT_CODES, NullEventLog
+from outcomes import Action, Outcome, outcome_name
+from rules import Rules
 
 class EmptyBjDeck(BlackJackDeck):
     def __init__(self) -> None:
@@ -55,7 +66,7 @@ def test_player_bj_payout():
     game.dealer_action()
     game.player_blackjack_win()
 
-    assert game.get_player().get_chips() == 750
+    assert game.get_player().get_chips() == 650
 
 def test_reset_table(game_random_deck: Table):
     game = game_random_deck
@@ -96,3 +107,352 @@ def test_splitable_checks(deck_for_splits: Table):
     game = deck_for_splits
     game.initial_deal()
     assert game.check_splitable() is True
+
+def test_deck_draws_in_order_without_removing():
+    deck = EmptyBjDeck()
+    deck.add_cards([Card(1, ""), Card(2, ""), Card(3, "")])
+
+    assert [deck.draw_card().value for _ in range(2)] == [1, 2]
+    assert deck.cards_remaining() == 1
+    assert len(deck.cards) == 3
+
+    deck.draw_card()
+    with pytest.raises(IndexError):
+        deck.draw_card()
+
+def test_deck_penetration():
+    deck = BlackJackDeck()
+    for _ in range(78):
+        deck.draw_card()
+
+    assert deck.cards_remaining() == 234
+    assert deck.penetration() == 0.25
+
+def test_player_running_totals():
+    player = Player([Card(1, ""), Card(6, "")])
+    assert player.get_card_values() == 17
+    assert player.is_soft() is True
+
+    player.add_card(Card(12, ""))
+    assert player.get_card_values() == 17
+    assert player.get_hard_total() == 17
+    assert player.is_soft() is False
+
+    player.clear_cards()
+    assert player.get_card_values() == 0
+    player.add_card(Card(1, ""))
+    player.add_card(Card(1, ""))
+    assert player.get_card_values() == 12
+    assert player.blackjack_check() is False
+
+def test_shoe_reshuffles_at_cut_card():
+    deck = BlackJackDeck(penetration=0.5)
+    cards = deck.cards
+    game = Table(Player([]), Player([]), deck)
+
+    while not deck.needs_reshuffle():
+        deck.draw_card()
+    assert deck.cards_drawn() == 156
+
+    game.initial_deal()
+    assert deck.cards_drawn() == 4
+    assert deck.cards is cards
+    assert len(deck.cards) == 312
+
+def test_custom_deck_has_no_cut_card():
+    deck = EmptyBjDeck()
+    deck.add_cards([Card(10, "")] * 4)
+    for _ in range(4):
+        deck.draw_card()
+
+    assert deck.needs_reshuffle() is False
+
+@pytest.fixture
+def three_seat_table() -> MultiSeatTable:
+    deck = EmptyBjDeck()
+    deck.add_cards(
+        [
+            # first round of the deal: seats then dealer
+            Card(10, ""), Card(1, ""), Card(9, ""), Card(10, ""),
+            # second round of the deal
+            Card(10, ""), Card(13, ""), Card(7, ""), Card(8, ""),
+            # hit for the last seat
+            Card(10, ""),
+        ]
+    )
+    players = [Player([], f"Seat {i}", 500) for i in range(3)]
+    table = MultiSeatTable(players, Player([], "Dealer"), deck)
+    return table
+
+def test_multi_seat_deals_round_robin(three_seat_table: MultiSeatTable):
+    table = three_seat_table
+    assert table.initial_deal() == [None, "blackjack", None]
+
+    values = [seat.get_player().get_card_values() for seat in table.get_seats()]
+    assert values == [20, 21, 16]
+    assert table.get_dealer().get_card_values() == 18
+
+def test_multi_seat_settles_every_seat(three_seat_table: MultiSeatTable):
+    table = three_seat_table
+    for seat in table.get_seats():
+        seat.player_bets(100)
+
+    table.initial_deal()
+    assert table.player_action(0, "stand") == "dealer_action"
+    assert table.player_action(2, "hit") == "bust"
+    table.dealer_action()
+
+    assert table.settle() == [["player"], ["blackjack"], ["bust"]]
+    chips = [seat.get_player().get_chips() for seat in table.get_seats()]
+    assert chips == [600, 650, 400]
+    assert table.get_dealer().get_cards() == []
+
+class RecordingLog(NullEventLog):
+    def __init__(self):
+        self.events = []
+
+    def deal(self, hand, card):
+        self.events.append(("deal", hand, card.value))
+
+    def settle(self, hand, result, amount):
+        self.events.append(("settle", hand, result, amount))
+
+    def end_round(self, chips):
+        self.events.append(("end_round", chips))
+
+def test_multi_seat_logs_every_seat(three_seat_table: MultiSeatTable):
+    table = three_seat_table
+    logs = [RecordingLog() for _ in table.get_seats()]
+    for seat, log in zip(table.get_seats(), logs):
+        seat.set_event_log(log)
+        seat.player_bets(100)
+
+    table.initial_deal()
+    table.player_action(0, "stand")
+    table.player_action(2, "hit")
+    table.dealer_action()
+    table.settle()
+
+    for log in logs:
+        dealer_cards = [event[2] for event in log.events if event[:2] == ("deal", DEALER_HAND)]
+        assert dealer_cards == [10, 8]
+    assert [log.events[-2:] for log in logs] == [
+        [("settle", PLAYER_HAND, "player", 100), ("end_round", 600)],
+        [("settle", PLAYER_HAND, "blackjack", 150), ("end_round", 650)],
+        [("settle", PLAYER_HAND, "bust", -100), ("end_round", 400)],
+    ]
+
+def test_dealer_blackjack_beats_three_card_21():
+    game = split_game([7, 1, 7, 13, 7])
+    assert game.player_action("hit") == "dealer_action"
+    assert game.dealer_action() == "compare"
+    assert game.compare_cards() == "dealer"
+    assert game.get_player().get_chips() == 400
+
+    # a split 7 dealt 7 then 7
+    game = split_game([7, 1, 7, 13, 7, 10, 7])
+    splits = game.create_split()
+    game.split_action(splits[0], "hit")
+    assert splits[0].get_card_values() == 21
+    assert game.collect_split_results(splits) == ["dealer", "dealer"]
+
+def test_multi_seat_limit():
+    with pytest.raises(ValueError):
+        MultiSeatTable([Player([]) for _ in range(8)], Player([]), EmptyBjDeck())
+
+def split_game(values: list[int], chips: int = 500, rules: Rules = Rules()) -> Table:
+    """a table dealing values in order, the player having bet 100"""
+    deck = EmptyBjDeck()
+    deck.add_cards([Card(value, "") for value in values])
+    game = Table(Player([], "Player", chips), Player([], "Dealer"), deck, rules)
+    game.player_bets(100)
+    game.initial_deal()
+    return game
+
+def test_split_hands_are_dealt_second_cards():
+    # player 8, 8 against dealer 10, 7
+    game = split_game([8, 10, 8, 7, 3, 10])
+    splits = game.create_split()
+
+    assert [split.get_card_values() for split in splits] == [11, 18]
+    assert [split.get_bet() for split in splits] == [100, 100]
+
+def test_resplit_inserts_the_next_hand():
+    game = split_game([8, 10, 8, 7, 8, 10, 2, 3])
+    splits = game.create_split()
+
+    assert game.split_action(splits[0], "split") == "split"
+    assert [split.get_card_values() for split in splits] == [10, 11, 18]
+    assert game.committed_chips() == 300
+
+def test_resplit_limits():
+    # only two bets can be covered
+    game = split_game([8, 10, 8, 7, 8, 10], chips=200)
+    splits = game.create_split()
+    assert game.split_action(splits[0], "split") == "invalid"
+
+    game = split_game([8, 10, 8, 7] + [8] * 8)
+    splits = game.create_split()
+    game.split_action(splits[0], "split")
+    game.split_action(splits[0], "split")
+    assert len(splits) == game.get_rules().max_split_hands
+    assert game.can_split(splits[0]) is False
+
+def test_no_splitting_by_rules():
+    game = split_game([8, 10, 8, 7, 3, 10], rules=Rules(max_split_hands=1))
+    assert game.check_splitable() is False
+    assert game.player_action("split") == "invalid"
+
+def test_split_aces_get_one_card():
+    game = split_game([1, 10, 1, 7, 1, 5])
+    splits = game.create_split()
+
+    assert all(split.is_finished() for split in splits)
+    assert game.can_split(splits[0]) is False
+    assert game.split_action(splits[1], "hit") == "dealer_action"
+    assert splits[1].get_card_values() == 16
+
+def test_split_double_doubles_one_bet():
+    game = split_game([8, 10, 8, 7, 3, 10, 9])
+    splits = game.create_split()
+
+    assert game.split_action(splits[0], "double") == "dealer_action"
+    assert [split.get_bet() for split in splits] == [200, 100]
+
+    game.split_dealer_action()
+    assert game.settle_splits() == ["player", "player"]
+    assert game.get_player().get_chips() == 800
+
+def test_splits_win_when_dealer_busts():
+    # dealer 10, 6 draws a 10
+    game = split_game([8, 10, 8, 6, 4, 5, 10])
+    game.create_split()
+    game.split_dealer_action()
+
+    assert game.settle_splits() == ["player", "player"]
+    assert game.get_player().get_chips() == 700
+
+def test_dealer_hits_soft_17_by_rules():
+    # dealer ace, 6 then a 2
+    values = [10, 1, 8, 6, 2]
+    assert split_game(values).dealer_action() == "compare"
+    assert split_game(values).get_dealer().get_card_values() == 17
+
+    game = split_game(values, rules=Rules(hit_soft_17=True))
+    game.dealer_action()
+    assert game.get_dealer().get_card_values() == 19
+
+def test_surrender_loses_half_the_bet():
+    values = [10, 10, 6, 7]
+    assert split_game(values).player_action("surrender") == "invalid"
+
+    game = split_game(values, rules=Rules(surrender=True))
+    assert game.player_action("surrender") == "surrender"
+    game.player_surrender()
+    assert game.get_player().get_chips() == 450
+    assert game.get_player().get_cards() == []
+
+def test_double_after_split_by_rules():
+    values = [8, 10, 8, 7, 3, 10]
+    game = split_game(values, rules=Rules(double_after_split=False))
+    splits = game.create_split()
+    assert game.split_action(splits[0], "double") == "invalid"
+
+def test_blackjack_payout_by_rules():
+    game = split_game([1, 10, 13, 7], rules=Rules(blackjack_payout=1.2))
+    game.dealer_action()
+    game.player_blackjack_win()
+    assert game.get_player().get_chips() == 620
+
+def test_shoe_size_by_rules():
+    game = create_game(Rules(decks=2))
+    assert game.get_deck().cards_remaining() == 104
+
+    with pytest.raises(ValueError):
+        Rules(decks=0)
+
+def test_snapshot_branches_from_one_position():
+    # player 6, 5 against dealer 10, 7, the next card is a 9
+    game = split_game([6, 10, 5, 7, 9, 10])
+    state = game.snapshot()
+
+    game.player_action("double")
+    assert game.get_player().get_bet() == 200
+    assert game.get_player().get_card_values() == 20
+
+    game.restore(state)
+    assert game.get_player().get_bet() == 100
+    assert game.get_player().get_card_values() == 11
+    assert game.player_action("hit") is None
+    assert game.get_player().get_card_values() == 20
+
+    game.restore(state)
+    game.player_action("stand")
+    game.dealer_action()
+    assert game.get_dealer().get_card_values() == 17
+    assert game.compare_cards() == "dealer"
+
+def test_snapshot_keeps_split_hands():
+    game = split_game([8, 10, 8, 7, 3, 10, 9])
+    game.create_split()
+    state = game.snapshot()
+
+    game.split_action(game.get_splits()[0], "double")
+    game.restore(state)
+
+    splits = game.get_splits()
+    assert [split.get_card_values() for split in splits] == [11, 18]
+    assert [split.get_bet() for split in splits] == [100, 100]
+    assert splits[0].get_name() == "split 1"
+
+class HitBelow17:
+    def decide(self, hand, dealer_card, can_split):
+        return "hit" if hand.get_card_values() < 17 else "stand"
+
+def test_play_rounds_returns_columns():
+    game = Table(Player([], "Player", 10**6), Player([]), BlackJackDeck(Random(1)))
+    results = game.play_rounds(500, HitBelow17(), 10)
+
+    assert len(results) == len(results.net) == len(results.cards_used) == 500
+    assert sum(results.net) == game.get_player().get_chips() - 10**6
+    assert set(results.outcomes) <= set(range(Outcome.SPLIT + 1))
+    assert min(results.cards_used) >= 4
+    assert memoryview(results.net).format == "q"
+    assert game.get_player().get_cards() == []
+
+def test_play_rounds_bet_policy():
+    game = Table(Player([], "Player", 100), Player([]), BlackJackDeck(Random(2)))
+    bets = []
+
+    def rising(table: Table) -> int:
+        bets.append(10 * (len(bets) + 1))
+        return bets[-1]
+
+    results = game.play_rounds(50, HitBelow17(), rising)
+    # stops at the first bet the player can not cover
+    assert len(results) == len(bets) - 1
+    assert bets[-1] > game.get_player().get_chips()
+
+def test_act_returns_outcomes():
+    game = split_game([10, 10, 2, 7, 5, 10])
+    assert game.act(Action.HIT) is Outcome.CONTINUE
+    assert game.act("fold") is Outcome.INVALID
+    assert game.player_action("fold") == "invalid"
+    assert game.act("hit") is Outcome.BUST
+
+def test_outcome_codes_are_logged_codes():
+    for action in Action:
+        assert ACTION_CODES[action.name.lower()] == ACTION_CODES[action] == action
+    for name, code in RESULT_CODES.items():
+        assert outcome_name(Outcome(code)) == name
+    assert outcome_name(Outcome.CONTINUE) is None
+
+def test_play_dealer_draws_in_one_loop():
+    # an ace rich shoe, the dealer draws aces up to a soft 17
+    game = split_game([10, 1, 9] + [1] * 12, rules=Rules(hit_soft_17=True))
+    assert game.play_dealer() == (18, Outcome.COMPARE)
+    assert len(game.get_dealer().get_cards()) == 8
+
+    game = split_game([10, 10, 9, 6, 10])
+    assert game.dealer_action() == "player"
+    assert game.get_dealer().get_card_values() == 26
@@ -1,23 +1,56 @@
-from random import shuffle
+from random import Random, shuffle
+
+
+SUITS = ("Diamond", "Heart", "Spade", "Club")
+FACE_CARD_SYMBOLS = {
+    1: "A",
+    11: "J",
+    12: "Q",
+    13: "K",
+}
 
 
 class Card:
+    """
+    A playing card.
+
+    Cards are interned: Card(value, suit) returns the same object
+    every time it is called with the same value and suit, so a shoe
+    is a list of shared references rather than new objects.
+
+    points is the card's blackjack value with the ace counted as 1.
+
+    code packs the card into a small int, (value - 1) * 4 + suit index,
+    for hot paths that want to index tables directly.
+    Suits outside SUITS share the code of a Diamond.
+    """
+
+    __slots__ = ("value", "suit", "symbol", "points", "code")
+
+    _interned: dict[tuple[int, str], "Card"] = {}
 
-    def __init__(self, value: int, suit: str) -> None:
-        self.value = value
-        self.suit = suit
+    def __new__(cls, value: int, suit: str) -> "Card":
+        card = cls._interned.get((value, suit))
+        if card is not None:
+            return card
 
-        face_card_values = {
-            1: "A",
-            11: "J",
-            12: "Q",
-            13: "K",
-        }
+        card = super().__new__(cls)
+        card.value = value
+        card.suit = suit
+        card.symbol = FACE_CARD_SYMBOLS.get(value, value)
+        card.points = min(value, 10)
+        card.code = (value - 1) * 4 + (SUITS.index(suit) if suit in SUITS else 0)
 
-        if value > 10 or value == 1:
-            self.symbol = face_card_values[value]
-        else:
-            self.symbol = value
+        cls._interned[(value, suit)] = card
+        return card
+
+    @staticmethod
+    def from_code(code: int) -> "Card":
+        return CARDS[code]
+
+    def __reduce__(self):
+        # keeps cards interned when pickled or copied
+        return Card, (self.value, self.suit)
 
     def __str__(self) -> str:
         return f"({self.symbol}, {self.suit})"
@@ -29,27 +62,190 @@ class Card:
         return str(self.symbol)
 
 
+# the 52 cards ordered by code
+CARDS = tuple(Card(value, suit) for value in range(1, 14) for suit in SUITS)
+
+# a standard deck in the order add_64_cards has always used
+STANDARD_DECK = tuple(Card(value, suit) for suit in SUITS for value in range(1, 14))
+
+
+def counting_system(weights: dict[int, int]) -> tuple[int, ...]:
+    """
+    Returns a card counting system for Deck.set_counting_system
+
+    Args:
+        weights: the count added when a card of the given points
+            (1 - 10) is drawn, missing points count 0
+    """
+    return tuple(weights.get(card.points, 0) for card in CARDS)
+
+
+HI_LO = counting_system({2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 10: -1, 1: -1})
+KO = counting_system({2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 1, 10: -1, 1: -1})
+
+
 class Deck:
-    def __init__(self) -> None:
+    """
+    Holds the cards in dealing order.
+
+    Cards are not removed when drawn, a cursor marks the next card
+    so drawing is constant time on large shoes.
+
+    A cut card can be placed with set_penetration, once the cursor
+    passes it needs_reshuffle is True.
+
+    The deck keeps a running count of the cards drawn, Hi-Lo unless
+    another system is set, updated as each card is drawn.
+
+    snapshot shares the card list instead of copying it, the deck
+    copies the list the next time it would change it (copy on write).
+
+    With a shoepool.ShoePool set, reshuffle takes the pool's next
+    shuffled shoe in place of the card list instead of shuffling,
+    and shuffles in place when the pool has none ready.
+    """
+
+    # class level defaults so subclasses that skip __init__ still work
+    _cursor = 0
+    _rng: Random | None = None
+    _cut_card: int | None = None
+    _running_count = 0
+    _count_weights: tuple[int, ...] = HI_LO
+    # True while a snapshot holds the card list
+    _shared = False
+    _pool = None
+
+    def __init__(self, rng: Random | None = None) -> None:
+        """
+        Args:
+            rng: random number generator used to shuffle,
+                the global one is used if not given
+        """
         self.cards = []
+        self._cursor = 0
+        self._rng = rng
 
     def add_64_cards(self) -> None:
         """
         Creates a standard deck with 64 cards.
         """
-        for suit in ["Diamond", "Heart", "Spade", "Club"]:
-            for x in range(1, 14):
-                self.cards.append(Card(x, suit))
+        self._own_cards()
+        self.cards.extend(STANDARD_DECK)
 
     def shuffle_deck(self) -> None:
-        shuffle(self.cards)
+        """shuffles the cards that have not been drawn yet"""
+        shuffle_cards = shuffle if self._rng is None else self._rng.shuffle
+        self._own_cards()
+        if self._cursor == 0:
+            shuffle_cards(self.cards)
+            return
+
+        remaining = self.cards[self._cursor :]
+        shuffle_cards(remaining)
+        self.cards[self._cursor :] = remaining
 
     def draw_card(self) -> Card:
-        return self.cards.pop(0)
-    
+        """
+        Returns the next card.
+        raises IndexError once every card has been drawn
+        """
+        card = self.cards[self._cursor]
+        self._cursor += 1
+        self._running_count += self._count_weights[card.code]
+        return card
+
+    def reshuffle(self) -> None:
+        """
+        puts every drawn card back and shuffles the whole deck in place,
+        or swaps in the next shoe of the shoe pool if one is set
+        """
+        self._cursor = 0
+        self._running_count = 0
+        if self._pool is not None:
+            shoe = self._pool.get_shoe()
+            if shoe is not None:
+                # the pool's shoe is a new list, nothing holds it
+                self.cards = shoe
+                self._shared = False
+                return
+        self.shuffle_deck()
+
+    def set_shoe_pool(self, pool) -> None:
+        """
+        Reshuffles from the given shoepool.ShoePool, None to shuffle
+        in place again. The pool's shoes must be the size of the deck.
+        """
+        if pool is not None and self.cards and len(self.cards) != 52 * pool.decks:
+            raise ValueError(
+                f"Shoe pool of {pool.decks} decks for a deck of {len(self.cards)} cards"
+            )
+        self._pool = pool
+
+    def set_penetration(self, penetration: float) -> None:
+        """
+        Places the cut card after the given fraction of the deck
+        """
+        if not 0 < penetration <= 1:
+            raise ValueError(f"Invalid penetration: {penetration}")
+        self._cut_card = int(len(self.cards) * penetration)
+
+    def needs_reshuffle(self) -> bool:
+        """True once the cut card has been reached"""
+        return self._cut_card is not None and self._cursor >= self._cut_card
+
+    def set_counting_system(self, weights: tuple[int, ...]) -> None:
+        """
+        Counts with the given system, see counting_system.
+        The cards already drawn are recounted.
+        """
+        self._count_weights = weights
+        self._running_count = sum(
+            weights[card.code] for card in self.cards[: self._cursor]
+        )
+
+    def running_count(self) -> int:
+        return self._running_count
+
+    def true_count(self) -> float:
+        """Returns the running count per deck left to be dealt"""
+        decks_remaining = max(self.cards_remaining(), 1) / 52
+        return self._running_count / decks_remaining
+
+    def cards_remaining(self) -> int:
+        return len(self.cards) - self._cursor
+
+    def cards_drawn(self) -> int:
+        return self._cursor
+
+    def penetration(self) -> float:
+        """Returns the fraction of the cards that have been drawn"""
+        if not self.cards:
+            return 0.0
+        return self._cursor / len(self.cards)
+
     def add_cards(self, cards: list[Card]):
+        self._own_cards()
         self.cards.extend(cards)
 
+    def _own_cards(self) -> None:
+        """copies the card list before changing it if a snapshot holds it"""
+        if self._shared:
+            self.cards = list(self.cards)
+            self._shared = False
+
+    def snapshot(self) -> tuple[list[Card], int, int]:
+        """
+        Returns the deck's state as (cards, cursor, running count),
+        to be given back to restore. The card list is shared, not copied.
+        """
+        self._shared = True
+        return self.cards, self._cursor, self._running_count
+
+    def restore(self, state: tuple[list[Card], int, int]) -> None:
+        """puts the deck back to a state returned by snapshot"""
+        self.cards, self._cursor, self._running_count = state
+        self._shared = True
+
 
 if __name__ == "__main__":
     card = [Card(12, ""), Card(1, "")]
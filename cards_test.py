@@ -0,0 +1,70 @@
+from random import Random
+
+from cards import CARDS, KO, Card, Deck
+
+
+def test_cards_are_interned():
+    assert Card(12, "Heart") is Card(12, "Heart")
+    assert Card(1, "") is Card(1, "")
+    assert Card(1, "") is not Card(1, "Diamond")
+
+
+def test_card_codes():
+    assert len(CARDS) == 52
+    assert all(card.code == code for code, card in enumerate(CARDS))
+    assert Card.from_code(Card(13, "Club").code) is Card(13, "Club")
+    assert repr(Card(11, "Spade")) == "J"
+    assert repr(Card(7, "Spade")) == "7"
+
+
+def test_standard_deck_reuses_interned_cards():
+    deck = Deck()
+    deck.add_64_cards()
+
+    assert len(deck.cards) == 52
+    assert set(deck.cards) == set(CARDS)
+
+
+def test_running_and_true_count():
+    deck = Deck()
+    deck.add_64_cards()
+    deck.add_64_cards()
+    deck.cards[:4] = [Card(2, "Heart"), Card(5, "Club"), Card(1, "Spade"), Card(4, "")]
+
+    for _ in range(4):
+        deck.draw_card()
+    assert deck.running_count() == 2
+    assert deck.true_count() == 2 / (100 / 52)
+
+    deck.set_counting_system(KO)
+    assert deck.running_count() == 2
+    deck.reshuffle()
+    assert deck.running_count() == 0
+
+
+def test_full_deck_counts_to_zero():
+    deck = Deck()
+    deck.add_64_cards()
+    for _ in range(52):
+        deck.draw_card()
+
+    assert deck.running_count() == 0
+    deck.set_counting_system(KO)
+    assert deck.running_count() == 4
+
+
+def test_deck_snapshot_is_copy_on_write():
+    deck = Deck(Random(0))
+    deck.add_64_cards()
+    deck.draw_card()
+    state = deck.snapshot()
+    order = list(deck.cards)
+
+    deck.draw_card()
+    deck.reshuffle()
+    assert deck.cards is not state[0]
+    assert state[0] == order
+
+    deck.restore(state)
+    assert deck.cards_drawn() == 1
+    assert deck.draw_card() is order[1]
@@ -0,0 +1,140 @@
+"""
+Strategies loaded from CSV and compiled into a flat lookup array.
+
+The CSV has a header of up cards and one row per hand:
+
+    hand,2,3,4,5,6,7,8,9,10,A
+    H12,H,H,S,S,S,H,H,H,H,H
+    S18,S,Ds,Ds,Ds,Ds,S,S,H,H,H
+    P8,P,P,P,P,P,P,P,P,P,P
+
+Rows are H<total> for hard hands, S<total> for soft hands and P<card>
+for pairs (PA or P1 for aces). Cells are
+    H   hit
+    S   stand
+    D   double, hit if doubling is not allowed
+    Ds  double, stand if doubling is not allowed
+    P   split
+    Rh  surrender, hit if surrendering is not allowed
+    Rs  surrender, stand if surrendering is not allowed
+Hands without a row hit below 17 and stand otherwise,
+a pair without a row is played like any other hand of its total.
+"""
+
+import csv
+from pathlib import Path
+
+from blackjack import Hand
+from cards import Card
+from simulator import Strategy
+
+# written by solver.py --csv for the rules Table plays
+DEFAULT_STRATEGY = Path(__file__).with_name("basic_strategy.csv")
+
+UP_CARDS = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "A")
+
+# what each cell means for (two card hands, hands of more cards)
+CELLS = {
+    "H": ("hit", "hit"),
+    "S": ("stand", "stand"),
+    "D": ("double", "hit"),
+    "Ds": ("double", "stand"),
+    "P": ("split", "hit"),
+    "Rh": ("surrender", "hit"),
+    "Rs": ("surrender", "stand"),
+}
+
+
+def lookup_index(total: int, soft: bool, pair: bool, two_cards: bool, up_card: int) -> int:
+    """position of a decision in the compiled array, up_card is its points"""
+    return (((total * 2 + soft) * 2 + pair) * 2 + two_cards) * 11 + up_card
+
+
+class CompiledStrategy(Strategy):
+    """
+    Decides every action with one lookup in a flat tuple indexed by
+    hand total, soft flag, pair flag, two card flag and up card.
+    """
+
+    def __init__(self, rows: dict[str, list[str]]) -> None:
+        """
+        Args:
+            rows: the cells of each CSV row by its hand label,
+                in the order of UP_CARDS
+        """
+        decisions = []
+        for total in range(32):
+            for soft in (False, True):
+                for pair in (False, True):
+                    for two_cards in (False, True):
+                        default = "hit" if total < 17 else "stand"
+                        decisions.extend([default] * 11)
+
+        self._decisions = decisions
+        # what to play if the table refuses the decision, see fallback
+        self._fallbacks = list(decisions)
+        # pair rows last so they override the hard and soft rows
+        for label in sorted(rows, key=lambda label: label[0].upper() == "P"):
+            self._compile_row(label, rows[label])
+        self._decisions = tuple(decisions)
+        self._fallbacks = tuple(self._fallbacks)
+
+    def _compile_row(self, label: str, cells: list[str]) -> None:
+        kind, value = label[0].upper(), label[1:]
+        if kind == "P":
+            points = 1 if value.upper() in ("A", "1") else int(value)
+            keys = [(12 if points == 1 else points * 2, points == 1, True, True)]
+        elif kind in ("H", "S"):
+            total, soft = int(value), kind == "S"
+            keys = [(total, soft, pair, two) for pair in (False, True) for two in (False, True)]
+        else:
+            raise ValueError(f"Invalid strategy row: {label}")
+
+        if len(cells) != len(UP_CARDS):
+            raise ValueError(f"Row {label} needs {len(UP_CARDS)} cells")
+
+        for up, cell in zip(UP_CARDS, cells):
+            up_card = 1 if up == "A" else int(up)
+            try:
+                two_card_action, action = CELLS[cell.strip()]
+            except KeyError:
+                raise ValueError(f"Invalid action {cell!r} in row {label}") from None
+
+            for total, soft, pair, two_cards in keys:
+                if pair and not two_cards:
+                    continue
+                if two_card_action == "split" and not pair:
+                    raise ValueError(f"Only pair rows can split: {label}")
+                index = lookup_index(total, soft, pair, two_cards, up_card)
+                self._decisions[index] = two_card_action if two_cards else action
+                self._fallbacks[index] = action
+
+    @classmethod
+    def from_csv(cls, path: str | Path = DEFAULT_STRATEGY) -> "CompiledStrategy":
+        with open(path, newline="") as file:
+            reader = csv.reader(file)
+            header = [cell.strip() for cell in next(reader)[1:]]
+            if tuple(header) != UP_CARDS:
+                raise ValueError(f"Invalid strategy header: {header}")
+            rows = {row[0].strip(): row[1:] for row in reader if row}
+        return cls(rows)
+
+    def decide(self, hand: Hand, dealer_card: Card, can_split: bool) -> str:
+        total = hand.get_card_values()
+        if total > 21:
+            return "stand"
+        return self._decisions[
+            (((total * 2 + hand.is_soft()) * 2 + can_split) * 2 + (len(hand.get_cards()) == 2))
+            * 11
+            + dealer_card.points
+        ]
+
+    def fallback(self, hand: Hand, dealer_card: Card, can_split: bool, action: str) -> str:
+        """the second action of the cell decide played, the stand of Ds and Rs"""
+        total = hand.get_card_values()
+        if total > 21:
+            return "stand"
+        two_cards = len(hand.get_cards()) == 2
+        return self._fallbacks[
+            lookup_index(total, hand.is_soft(), can_split, two_cards, dealer_card.points)
+        ]
@@ -0,0 +1,83 @@
+import pytest
+
+from blackjack import Player
+from blackjack_test import split_game
+from cards import Card
+from compiled_strategy import CompiledStrategy
+from outcomes import Outcome
+from rules import Rules
+from simulator import Simulator
+
+TEN = Card(10, "")
+
+
+@pytest.fixture(scope="module")
+def strategy() -> CompiledStrategy:
+    return CompiledStrategy.from_csv()
+
+
+def hand(*values: int) -> Player:
+    return Player([Card(value, "") for value in values])
+
+
+def test_hard_and_soft_hands(strategy: CompiledStrategy):
+    assert strategy.decide(hand(10, 6), TEN, False) == "hit"
+    assert strategy.decide(hand(10, 6), Card(6, ""), False) == "stand"
+    assert strategy.decide(hand(1, 7), Card(9, ""), False) == "hit"
+    assert strategy.decide(hand(13, 9), Card(1, ""), False) == "stand"
+
+
+def test_double_falls_back_after_two_cards(strategy: CompiledStrategy):
+    assert strategy.decide(hand(5, 6), Card(6, ""), False) == "double"
+    assert strategy.decide(hand(2, 3, 6), Card(6, ""), False) == "hit"
+    assert strategy.decide(hand(1, 7), Card(4, ""), False) == "double"
+    assert strategy.decide(hand(1, 4, 3), Card(4, ""), False) == "stand"
+
+
+def test_pairs(strategy: CompiledStrategy):
+    assert strategy.decide(hand(8, 8), TEN, True) == "hit"
+    assert strategy.decide(hand(8, 8), Card(7, ""), True) == "split"
+    assert strategy.decide(hand(8, 8), Card(7, ""), False) == "hit"
+    assert strategy.decide(hand(1, 1), TEN, True) == "split"
+    assert strategy.decide(hand(12, 13), Card(6, ""), True) == "stand"
+
+
+def test_missing_rows_use_defaults():
+    strategy = CompiledStrategy({"H16": ["S"] * 10})
+    assert strategy.decide(hand(10, 6), TEN, False) == "stand"
+    assert strategy.decide(hand(10, 5), TEN, False) == "hit"
+    assert strategy.decide(hand(10, 8), TEN, False) == "stand"
+
+
+def test_invalid_rows():
+    with pytest.raises(ValueError):
+        CompiledStrategy({"H16": ["P"] * 10})
+    with pytest.raises(ValueError):
+        CompiledStrategy({"X16": ["S"] * 10})
+    with pytest.raises(ValueError):
+        CompiledStrategy({"H16": ["S"] * 9})
+
+
+def test_plays_through_simulator(strategy: CompiledStrategy):
+    result = Simulator(strategy, seed=5).run(2000)
+    assert result.rounds == 2000
+
+
+def test_refused_double_falls_back_to_the_cell(strategy: CompiledStrategy):
+    # aces split against a 4, the first split is A, 7: Ds with no double after split
+    game = split_game([1, 4, 1, 10, 7, 8], rules=Rules(double_after_split=False, split_aces_one_card=False))
+    assert game.player_action("split") == "split"
+
+    split = game.create_split()[0]
+    assert game.split_strategy_act(split, strategy) is Outcome.DEALER_ACTION
+    assert split.get_card_values() == 18
+    assert len(split.get_cards()) == 2
+    assert split.get_bet() == 100
+
+
+def test_refused_surrender_falls_back_to_the_cell():
+    strategy = CompiledStrategy({"H16": ["Rs"] * 10})
+    game = split_game([10, 10, 6, 7, 5], rules=Rules(surrender=False))
+
+    assert game.strategy_act(strategy) is Outcome.DEALER_ACTION
+    assert game.get_player().get_card_values() == 16
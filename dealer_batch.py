@@ -0,0 +1,123 @@
+"""
+Resolves many dealer hands at once with numpy.
+
+Table.dealer_action plays one dealer hand a card at a time. The
+functions here play N hands together, one numpy operation per card
+position, so the dealer side of a million hands can be evaluated for
+EV tables without a Python call per card.
+
+Cards are given as their values (1 - 13) like Card.value.
+numpy is only needed by this module.
+"""
+
+import numpy as np
+
+from cards import Deck
+
+# more than enough cards for a dealer to reach 17 from any up card
+DRAW_WINDOW = 12
+
+
+def resolve_dealer_hands(
+    up_cards: np.ndarray, draws: np.ndarray, hit_soft_17: bool = False
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Plays out N dealer hands, drawing until 17 like Table.dealer_action
+
+    Args:
+        up_cards: shape (N,), the dealer's face up card
+        draws: shape (N, K), the cards each dealer would draw next,
+            hole card first
+        hit_soft_17: the dealers hit a soft 17, see Rules.hit_soft_17
+
+    Returns:
+        totals: final total of each hand
+        busted: True where the hand went over 21
+        cards_used: how many cards of draws each hand took
+
+    raises IndexError if K is too small for a hand to finish
+    """
+    up_cards = np.asarray(up_cards)
+    draws = np.asarray(draws)
+
+    hard = np.minimum(up_cards, 10).astype(np.int8)
+    aces = up_cards == 1
+    cards_used = np.zeros(len(up_cards), dtype=np.int8)
+
+    # indices of the hands still drawing, most stop after a card or two
+    # so later columns only touch the few that are left
+    active = np.arange(len(up_cards))
+    for column in range(draws.shape[1]):
+        card = np.minimum(draws[active, column], 10).astype(np.int8)
+        active_hard = hard[active] + card
+        active_aces = aces[active] | (card == 1)
+
+        hard[active] = active_hard
+        aces[active] = active_aces
+        cards_used[active] += 1
+
+        soft = active_aces & (active_hard <= 11)
+        active_totals = active_hard + soft * 10
+        drawing = active_totals < 17
+        if hit_soft_17:
+            drawing |= soft & (active_totals == 17)
+        active = active[drawing]
+        if len(active) == 0:
+            break
+    else:
+        if len(active):
+            raise IndexError("not enough cards to finish every dealer hand")
+
+    totals = hard + (aces & (hard <= 11)) * 10
+    return totals, totals > 21, cards_used
+
+
+def resolve_from_shoes(
+    up_cards: np.ndarray,
+    shoes: np.ndarray,
+    cursors: np.ndarray,
+    hit_soft_17: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Plays out N dealer hands drawing from shoe states
+
+    Args:
+        up_cards: shape (N,), the dealer's face up card
+        shoes: shape (N, L) with one shoe per hand,
+            or shape (L,) for a shoe shared by every hand
+        cursors: shape (N,), position of the next card in each shoe
+        hit_soft_17: the dealers hit a soft 17
+
+    Returns:
+        totals, busted and the cursors moved past the cards drawn
+    """
+    shoes = np.asarray(shoes)
+    cursors = np.asarray(cursors)
+    length = shoes.shape[-1]
+
+    positions = cursors[:, None] + np.arange(DRAW_WINDOW)
+    in_shoe = positions < length
+    positions = np.minimum(positions, length - 1)
+
+    if shoes.ndim == 1:
+        draws = shoes[positions]
+    else:
+        draws = np.take_along_axis(shoes, positions, axis=1)
+
+    # past the end of a shoe is an ace so short hands keep drawing
+    # and raise instead of silently standing
+    draws = np.where(in_shoe, draws, 1)
+
+    totals, busted, cards_used = resolve_dealer_hands(up_cards, draws, hit_soft_17)
+
+    new_cursors = cursors + cards_used
+    if (new_cursors > length).any():
+        raise IndexError("draw from an empty shoe")
+
+    return totals, busted, new_cursors
+
+
+def deck_values(deck: Deck) -> np.ndarray:
+    """Returns the values of the cards left in a deck, in dealing order"""
+    remaining = deck.cards[deck.cards_drawn() :]
+    return np.fromiter((card.value for card in remaining), np.int8, len(remaining))
@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from blackjack import BlackJackDeck, Player, Table
+from dealer_batch import deck_values, resolve_dealer_hands, resolve_from_shoes
+from rules import Rules
+
+
+@pytest.mark.parametrize("hit_soft_17", [False, True])
+def test_matches_table_dealer_action(hit_soft_17: bool):
+    deck = BlackJackDeck()
+    shoe = deck_values(deck)
+    dealer = Player([])
+    table = Table(Player([]), dealer, deck, Rules(hit_soft_17=hit_soft_17))
+
+    up_cards = []
+    cursors = []
+    expected = []
+    while deck.cards_remaining() > 20:
+        table.dealer_draw_card()
+        up_cards.append(dealer.get_cards()[0].value)
+        cursors.append(deck.cards_drawn())
+        table.dealer_action()
+        expected.append(dealer.get_card_values())
+        dealer.clear_cards()
+
+    totals, busted, new_cursors = resolve_from_shoes(
+        np.array(up_cards), shoe, np.array(cursors), hit_soft_17
+    )
+
+    assert totals.tolist() == expected
+    assert busted.tolist() == [total > 21 for total in expected]
+    assert (new_cursors[:-1] + 1).tolist() == cursors[1:]
+
+
+def test_soft_hands():
+    up_cards = np.array([1, 1, 6])
+    draws = np.array(
+        [
+            [6, 10, 10],  # soft 17 stands
+            [5, 13, 3],  # soft 16, hard 16, 19
+            [1, 10, 10],  # soft 17 stands
+        ]
+    )
+    totals, busted, cards_used = resolve_dealer_hands(up_cards, draws)
+
+    assert totals.tolist() == [17, 19, 17]
+    assert busted.tolist() == [False, False, False]
+    assert cards_used.tolist() == [1, 3, 1]
+
+    totals, busted, cards_used = resolve_dealer_hands(up_cards, draws, hit_soft_17=True)
+
+    assert totals.tolist() == [17, 19, 17]
+    assert cards_used.tolist() == [2, 3, 2]
+
+
+def test_runs_out_of_cards():
+    with pytest.raises(IndexError):
+        resolve_from_shoes(np.array([2]), np.array([2, 2]), np.array([0]))
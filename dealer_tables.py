@@ -0,0 +1,130 @@
+"""
+Probabilities of the dealer's final total for each up card.
+
+A table maps the up card's points (1 - 10) to the chance of the dealer
+finishing on 17, 18, 19, 20, 21 and bust. The dealer draws the hole
+card and plays on as Table.dealer_action does, with no peek.
+
+Tables are built once per rule set and shoe, either for an infinite
+deck or for a finite shoe composition (see solver), saved as JSON in
+the cache directory and loaded from there the first time they are
+asked for in a process.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+# chance of drawing a card of each points value from an infinite deck
+INFINITE_DECK = tuple(4 / 13 if points == 10 else 1 / 13 for points in range(1, 11))
+
+CACHE_DIR = Path(
+    os.environ.get("BLACKJACK_CACHE_DIR", Path.home() / ".cache" / "card-games")
+)
+
+_tables: dict[str, dict[int, tuple[float, ...]]] = {}
+
+
+def _infinite_outcomes(hard: int, aces: bool, hit_soft_17: bool) -> tuple[float, ...]:
+    @lru_cache(maxsize=None)
+    def outcomes(hard: int, aces: bool) -> tuple[float, ...]:
+        total = hard + 10 if aces and hard <= 11 else hard
+        result = [0.0] * 6
+        if total > 21:
+            result[5] = 1.0
+            return tuple(result)
+        if total >= 17 and not (hit_soft_17 and total == 17 and hard == 7):
+            result[total - 17] = 1.0
+            return tuple(result)
+
+        for index, chance in enumerate(INFINITE_DECK):
+            points = index + 1
+            for i, p in enumerate(outcomes(hard + points, aces or points == 1)):
+                result[i] += chance * p
+        return tuple(result)
+
+    return outcomes(hard, aces)
+
+
+def build_infinite_table(hit_soft_17: bool = False) -> dict[int, tuple[float, ...]]:
+    return {
+        up_card: _infinite_outcomes(up_card, up_card == 1, hit_soft_17)
+        for up_card in range(1, 11)
+    }
+
+
+def build_shoe_table(
+    composition: tuple[int, ...], hit_soft_17: bool = False
+) -> dict[int, tuple[float, ...]]:
+    """
+    Returns the table for a shoe composition, see solver.
+    Up cards with none left in the shoe are left out.
+    """
+    # numpy is only needed for finite shoes
+    from solver import dealer_distributions, remove_card
+
+    table = {}
+    for up_card in range(1, 11):
+        if composition[up_card - 1] == 0:
+            continue
+        after = remove_card(composition, up_card)
+        row = dealer_distributions([after], up_card, hit_soft_17)[0]
+        table[up_card] = tuple(row.tolist())
+    return table
+
+
+def table_key(composition: tuple[int, ...] | None, hit_soft_17: bool) -> str:
+    rules = "h17" if hit_soft_17 else "s17"
+    if composition is None:
+        return f"{rules}-infinite"
+    return f"{rules}-{'-'.join(map(str, composition))}"
+
+
+def dealer_table(
+    composition: tuple[int, ...] | None = None, hit_soft_17: bool = False
+) -> dict[int, tuple[float, ...]]:
+    """
+    Returns the dealer's outcome table, for an infinite deck when no
+    composition is given. Loaded from the disk cache, or built and
+    saved there if it has not been built before.
+    """
+    key = table_key(composition, hit_soft_17)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+
+    path = CACHE_DIR / f"dealer-{key}.json"
+    try:
+        with open(path) as file:
+            table = {int(up): tuple(row) for up, row in json.load(file).items()}
+    except (FileNotFoundError, ValueError):
+        if composition is None:
+            table = build_infinite_table(hit_soft_17)
+        else:
+            table = build_shoe_table(composition, hit_soft_17)
+        _save(path, table)
+
+    _tables[key] = table
+    return table
+
+
+def _save(path: Path, table: dict[int, tuple[float, ...]]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written under another name first so readers never see half a file
+        partial = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(partial, "w") as file:
+            json.dump(table, file)
+        os.replace(partial, path)
+    except OSError:
+        # the cache is only an optimisation
+        pass
+
+
+if __name__ == "__main__":
+    labels = ["17", "18", "19", "20", "21", "bust"]
+    print("up    " + " ".join(f"{label:>6}" for label in labels))
+    for up_card, row in dealer_table().items():
+        name = "A" if up_card == 1 else up_card
+        print(f"{name:<5} " + " ".join(f"{p:>6.3f}" for p in row))
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+import dealer_tables
+from dealer_tables import dealer_table
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(dealer_tables, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(dealer_tables, "_tables", {})
+    return tmp_path
+
+
+def test_infinite_deck_table():
+    table = dealer_table()
+
+    assert sorted(table) == list(range(1, 11))
+    for row in table.values():
+        assert sum(row) == pytest.approx(1)
+    assert table[6][-1] == pytest.approx(0.4232, abs=1e-4)
+    assert table[1][-1] == pytest.approx(0.1153, abs=1e-4)
+
+
+def test_hitting_soft_17_busts_more():
+    assert dealer_table(hit_soft_17=True)[6][-1] > dealer_table()[6][-1]
+
+
+def test_table_is_cached_on_disk(cache_dir, monkeypatch):
+    table = dealer_table()
+    path = cache_dir / "dealer-s17-infinite.json"
+    assert path.exists()
+
+    saved = json.loads(path.read_text())
+    saved["6"] = [0, 0, 0, 0, 0, 1]
+    path.write_text(json.dumps(saved))
+    monkeypatch.setattr(dealer_tables, "_tables", {})
+
+    assert dealer_table()[6] == (0, 0, 0, 0, 0, 1)
+    assert dealer_table()[5] == table[5]
+
+
+def test_shoe_table():
+    pytest.importorskip("numpy")
+    table = dealer_table((0, 0, 0, 0, 1, 1, 0, 0, 0, 4))
+
+    # up card 6 draws the 5 (11, then 21) or a ten (16, then 21 or bust)
+    assert table[6][4] == pytest.approx(1 / 5 + 4 / 5 * 1 / 4)
+    assert table[6][-1] == pytest.approx(4 / 5 * 3 / 4)
+    assert 1 not in table
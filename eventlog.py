@@ -0,0 +1,156 @@
+"""
+Append only log of what happens at a Table, in a compact binary format.
+
+Every event is one fixed size little endian record:
+
+    round   uint32  number of the round, counted from the log's start
+    kind    uint8   DEAL, ACTION, SETTLE or ROUND_END
+    hand    uint8   PLAYER_HAND, DEALER_HAND or SPLIT_HAND + split index
+    value   uint8   card code, action code or result code
+    amount  int64   chips won or lost, or the player's chips at ROUND_END
+
+Records go through a buffered writer and are read back with mmap,
+so replaying does not parse or copy the file.
+"""
+
+import mmap
+import os
+import struct
+from typing import Iterator
+
+from cards import Card
+from outcomes import Action, Outcome
+
+RECORD = struct.Struct("<IBBBq")
+
+DEAL = 0
+ACTION = 1
+SETTLE = 2
+ROUND_END = 3
+
+PLAYER_HAND = 0
+DEALER_HAND = 1
+SPLIT_HAND = 2
+
+ACTION_CODES: dict = {action.name.lower(): action.value for action in Action}
+# actions are logged by name or as an Action
+ACTION_CODES.update((action, action.value) for action in Action)
+RESULT_CODES = {
+    outcome.name.lower(): outcome.value
+    for outcome in Outcome
+    if outcome <= Outcome.SURRENDER
+}
+UNKNOWN = 255
+
+
+class NullEventLog:
+    """Discards every event, used by a Table with no log attached"""
+
+    def deal(self, hand: int, card: Card) -> None:
+        pass
+
+    def action(self, hand: int, action: str) -> None:
+        pass
+
+    def settle(self, hand: int, result: str, amount: int) -> None:
+        pass
+
+    def end_round(self, chips: int) -> None:
+        pass
+
+
+class EventLog(NullEventLog):
+    """
+    Writes events to a file.
+
+    An existing log is appended to, its rounds numbered on from the
+    last round already in it.
+
+    Usable as a context manager, the buffer is written when closed.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16) -> None:
+        self._round = _next_round(path)
+        self._file = open(path, "ab", buffering=buffer_size)
+        self._pack = RECORD.pack
+
+    def deal(self, hand: int, card: Card) -> None:
+        self._file.write(self._pack(self._round, DEAL, hand, card.code, 0))
+
+    def action(self, hand: int, action: str) -> None:
+        code = ACTION_CODES.get(action, UNKNOWN)
+        self._file.write(self._pack(self._round, ACTION, hand, code, 0))
+
+    def settle(self, hand: int, result: str, amount: int) -> None:
+        code = RESULT_CODES.get(result, UNKNOWN)
+        self._file.write(self._pack(self._round, SETTLE, hand, code, amount))
+
+    def end_round(self, chips: int) -> None:
+        self._file.write(self._pack(self._round, ROUND_END, PLAYER_HAND, 0, chips))
+        self._round += 1
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _next_round(path: str) -> int:
+    """the number after the last round in the log, 0 for a new log"""
+    try:
+        with open(path, "rb") as file:
+            size = file.seek(0, os.SEEK_END)
+            usable = size - size % RECORD.size
+            if usable == 0:
+                return 0
+            file.seek(usable - RECORD.size)
+            return RECORD.unpack(file.read(RECORD.size))[0] + 1
+    except FileNotFoundError:
+        return 0
+
+
+def read_events(path: str) -> Iterator[tuple[int, int, int, int, int]]:
+    """
+    Yields every event in the log as (round, kind, hand, value, amount)
+    """
+    with open(path, "rb") as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # an empty file cannot be mapped
+            return
+
+    with mapped:
+        view = memoryview(mapped)
+        usable = len(view) - len(view) % RECORD.size
+        try:
+            yield from RECORD.iter_unpack(view[:usable])
+        finally:
+            view.release()
+
+
+def read_rounds(path: str) -> Iterator[list[tuple[int, int, int, int, int]]]:
+    """Yields the events of the log grouped by round"""
+    events = []
+    for event in read_events(path):
+        events.append(event)
+        if event[1] == ROUND_END:
+            yield events
+            events = []
+    if events:
+        yield events
+
+
+def dealt_cards(events) -> list[Card]:
+    """
+    Returns the cards dealt in the events in the order they came out
+    of the shoe, enough to rebuild a Deck and play the rounds again
+    """
+    return [Card.from_code(value) for _, kind, _, value, _ in events if kind == DEAL]
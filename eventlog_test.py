@@ -0,0 +1,93 @@
+from blackjack import Player, Table
+from cards import Card, Deck
+from eventlog import (
+    ACTION,
+    DEAL,
+    DEALER_HAND,
+    PLAYER_HAND,
+    ROUND_END,
+    SETTLE,
+    EventLog,
+    dealt_cards,
+    read_events,
+    read_rounds,
+)
+from simulator import BasicStrategy, Simulator
+
+
+def test_records_a_round(tmp_path):
+    path = tmp_path / "rounds.log"
+    deck = Deck()
+    deck.add_cards([Card(value, "Heart") for value in (10, 9, 6, 8, 3)])
+    game = Table(Player([]), Player([]), deck)
+
+    with EventLog(path) as log:
+        game.set_event_log(log)
+        game.player_bets(100)
+        game.initial_deal()
+        game.player_action("hit")
+        game.player_action("stand")
+        game.dealer_action()
+        game.compare_cards()
+        game.player_win()
+
+    events = list(read_events(path))
+    assert [(kind, hand) for _, kind, hand, _, _ in events] == [
+        (DEAL, PLAYER_HAND),
+        (DEAL, DEALER_HAND),
+        (DEAL, PLAYER_HAND),
+        (DEAL, DEALER_HAND),
+        (ACTION, PLAYER_HAND),
+        (DEAL, PLAYER_HAND),
+        (ACTION, PLAYER_HAND),
+        (SETTLE, PLAYER_HAND),
+        (ROUND_END, PLAYER_HAND),
+    ]
+    assert events[-2][4] == 100
+    assert events[-1][4] == 600
+    assert [card.value for card in dealt_cards(events)] == [10, 9, 6, 8, 3]
+
+
+def test_replays_simulated_rounds(tmp_path):
+    path = tmp_path / "rounds.log"
+    simulator = Simulator(BasicStrategy(), seed=1)
+
+    with EventLog(path) as log:
+        simulator.get_table().set_event_log(log)
+        result = simulator.run(300)
+
+    rounds = list(read_rounds(path))
+    assert len(rounds) == 300
+    assert all(events[-1][1] == ROUND_END for events in rounds)
+
+    settled = sum(event[4] for event in read_events(path) if event[1] == SETTLE)
+    assert settled == result.net
+
+
+def test_large_bankroll(tmp_path):
+    path = tmp_path / "rounds.log"
+    simulator = Simulator(BasicStrategy(), bankroll=3 * 10**9, seed=1)
+
+    with EventLog(path) as log:
+        simulator.get_table().set_event_log(log)
+        simulator.run(10)
+
+    assert list(read_events(path))[-1][4] == simulator.get_table().get_player().get_chips()
+
+
+def test_reopened_log_numbers_rounds_on(tmp_path):
+    path = tmp_path / "rounds.log"
+    for _ in range(2):
+        simulator = Simulator(BasicStrategy(), seed=1)
+        with EventLog(path) as log:
+            simulator.get_table().set_event_log(log)
+            simulator.run(3)
+
+    rounds = [events[0][0] for events in read_rounds(path)]
+    assert rounds == [0, 1, 2, 3, 4, 5]
+
+
+def test_empty_log(tmp_path):
+    path = tmp_path / "empty.log"
+    EventLog(path).close()
+    assert list(read_events(path)) == []
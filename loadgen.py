@@ -0,0 +1,67 @@
+"""
+Load generator for server.py.
+
+Opens many connections at once, each playing rounds with a hit below
+17 strategy, and reports throughput and reply latency percentiles.
+
+    python loadgen.py --connections 2000 --rounds 20
+"""
+
+import asyncio
+import time
+
+
+async def play(host: str, port: int, rounds: int, latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def send(command: str) -> str:
+        start = time.perf_counter()
+        writer.write(command.encode() + b"\n")
+        reply = (await reader.readline()).decode()
+        latencies.append(time.perf_counter() - start)
+        return reply
+
+    for _ in range(rounds):
+        reply = await send("BET 10")
+        if reply.startswith("ERR"):
+            break
+
+        while reply.startswith("CARDS"):
+            value = int(reply.split("value=")[1].split()[0])
+            reply = await send("HIT" if value < 17 else "STAND")
+
+    await send("QUIT")
+    writer.close()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(host: str, port: int, connections: int, rounds: int) -> list[float]:
+    latencies: list[float] = []
+    await asyncio.gather(
+        *(play(host, port, rounds, latencies) for _ in range(connections))
+    )
+    return latencies
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test the blackjack server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    latencies = asyncio.run(run(args.host, args.port, args.connections, args.rounds))
+    elapsed = time.perf_counter() - start
+
+    print(f"requests: {len(latencies)} in {elapsed:.2f}s")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} requests/s")
+    print(f"p50: {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
@@ -0,0 +1,79 @@
+"""
+Integer codes for the player's actions and the outcomes of a Table.
+
+Table's state machine passes these around instead of strings, so
+every branch is an int comparison and dispatch is a tuple index.
+The values of Action and of the settlement outcomes (PLAYER to
+SURRENDER) are also the codes written to the event log.
+
+Action.parse and outcome_name convert to and from the strings used
+by View, the server and Strategy.decide.
+
+The Outcome members are module globals too, as re does with its
+flags: reading a member off its enum class costs several times a
+global read, which shows on the per decision path.
+"""
+
+from enum import IntEnum
+
+
+class Action(IntEnum):
+    HIT = 0
+    STAND = 1
+    DOUBLE = 2
+    SPLIT = 3
+    SURRENDER = 4
+
+    @classmethod
+    def parse(cls, action) -> "Action | None":
+        """Returns the Action for an action or its name, None if invalid"""
+        return parse_action(action)
+
+
+class Outcome(IntEnum):
+    # results of a hand, settled
+    PLAYER = 0
+    DEALER = 1
+    TIED = 2
+    BLACKJACK = 3
+    BUST = 4
+    SURRENDER = 5
+    SPLIT = 6
+    # steps of the state machine
+    DEALER_ACTION = 7
+    COMPARE = 8
+    INVALID = 9
+    # the player is to act again
+    CONTINUE = 10
+
+
+_ACTIONS: dict = {action.name.lower(): action for action in Action}
+_ACTIONS.update((action, action) for action in Action)
+
+# Action.parse without the classmethod call
+parse_action = _ACTIONS.get
+
+# in definition order, unpacking fails if a member is missing here
+(
+    PLAYER,
+    DEALER,
+    TIED,
+    BLACKJACK,
+    BUST,
+    SURRENDER,
+    SPLIT,
+    DEALER_ACTION,
+    COMPARE,
+    INVALID,
+    CONTINUE,
+) = Outcome
+
+# the strings Table's methods used to return, CONTINUE was None
+OUTCOME_NAMES: tuple[str | None, ...] = tuple(
+    None if outcome is Outcome.CONTINUE else outcome.name.lower() for outcome in Outcome
+)
+
+
+def outcome_name(outcome: Outcome) -> str | None:
+    """Returns the string for an outcome, None for CONTINUE"""
+    return OUTCOME_NAMES[outcome]
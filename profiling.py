@@ -0,0 +1,149 @@
+"""
+Opt in timing of the phases of a round at a Table.
+
+A PhaseProfiler counts the calls to each phase and the nanoseconds
+spent in them, measured with perf_counter_ns:
+
+    deal            initial_deal
+    player_action   act, split_act and the handlers they dispatch to
+    dealer          play_dealer, dealer_action, split_dealer_action
+    settle          compare, the win, lose and push methods and
+                    the settle methods they call
+
+Instrumenting a table puts timed wrappers of its methods in the
+instance's __dict__, in front of the class's methods. A table that
+is not instrumented runs the class's methods untouched, so profiling
+costs nothing until it is turned on.
+
+    profiler = PhaseProfiler()
+    table.set_profiler(profiler)
+    ...
+    print(profiler.prometheus())
+"""
+
+from time import perf_counter_ns
+from typing import Callable
+
+PHASES = {
+    "deal": ("initial_deal",),
+    "player_action": (
+        "act",
+        "split_act",
+        "player_hit",
+        "_stand",
+        "_double",
+        "_split",
+        "_surrender_hand",
+    ),
+    "dealer": ("play_dealer", "dealer_action", "split_dealer_action"),
+    "settle": (
+        "compare",
+        "player_win",
+        "player_lose",
+        "push",
+        "player_blackjack_win",
+        "player_surrender",
+        "settle_blackjack",
+        "settle_win",
+        "settle_surrender",
+        "settle_lose",
+        "settle_push",
+        "settle_splits",
+    ),
+}
+
+
+class PhaseProfiler:
+    """
+    Counters of calls and nanoseconds per phase, shared by every table
+    it instruments.
+
+    A phase entered again before it returns, like dealer_action calling
+    play_dealer, is timed once as part of the outer call.
+    """
+
+    def __init__(self) -> None:
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.nanoseconds = dict.fromkeys(PHASES, 0)
+        self._depth = dict.fromkeys(PHASES, 0)
+
+    def reset(self) -> None:
+        for phase in PHASES:
+            self.calls[phase] = 0
+            self.nanoseconds[phase] = 0
+
+    def timed(self, phase: str, method: Callable) -> Callable:
+        """Returns method wrapped to add its calls and time to phase"""
+        calls = self.calls
+        nanoseconds = self.nanoseconds
+        depth = self._depth
+        clock = perf_counter_ns
+
+        def timed_method(*args, **kwargs):
+            if depth[phase]:
+                return method(*args, **kwargs)
+
+            depth[phase] = 1
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                nanoseconds[phase] += clock() - start
+                calls[phase] += 1
+                depth[phase] = 0
+
+        timed_method.__wrapped__ = method
+        return timed_method
+
+    def instrument(self, table) -> None:
+        """times the phases of table's rounds"""
+        for phase, names in PHASES.items():
+            for name in names:
+                # bound from the class, so instrumenting twice does not time twice
+                method = getattr(type(table), name).__get__(table)
+                setattr(table, name, self.timed(phase, method))
+
+    @staticmethod
+    def uninstrument(table) -> None:
+        """puts back the table's own methods"""
+        for names in PHASES.values():
+            for name in names:
+                table.__dict__.pop(name, None)
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """
+        Returns the counters of each phase as
+        {phase: {"calls": n, "nanoseconds": n, "mean_ns": n}}
+        """
+        return {
+            phase: {
+                "calls": self.calls[phase],
+                "nanoseconds": self.nanoseconds[phase],
+                "mean_ns": self.nanoseconds[phase] // self.calls[phase]
+                if self.calls[phase]
+                else 0,
+            }
+            for phase in PHASES
+        }
+
+    def prometheus(self, prefix: str = "blackjack_table") -> str:
+        """Returns the counters in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_phase_calls_total Calls to each phase of a round.",
+            f"# TYPE {prefix}_phase_calls_total counter",
+        ]
+        lines.extend(
+            f'{prefix}_phase_calls_total{{phase="{phase}"}} {calls}'
+            for phase, calls in self.calls.items()
+        )
+        lines.extend(
+            [
+                f"# HELP {prefix}_phase_seconds_total Time spent in each phase of a round.",
+                f"# TYPE {prefix}_phase_seconds_total counter",
+            ]
+        )
+        lines.extend(
+            f'{prefix}_phase_seconds_total{{phase="{phase}"}} {nanoseconds / 1e9:.9f}'
+            for phase, nanoseconds in self.nanoseconds.items()
+        )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,53 @@
+from blackjack import Table
+from profiling import PHASES, PhaseProfiler
+from simulator import DealerStrategy, Simulator
+
+
+def profiled_simulator() -> tuple[Simulator, PhaseProfiler]:
+    profiler = PhaseProfiler()
+    simulator = Simulator(DealerStrategy(), seed=1)
+    simulator.get_table().set_profiler(profiler)
+    return simulator, profiler
+
+
+def test_profiler_times_each_phase():
+    simulator, profiler = profiled_simulator()
+    simulator.run(200)
+
+    snapshot = profiler.snapshot()
+    assert snapshot["deal"]["calls"] == 200
+    for phase in PHASES:
+        assert snapshot[phase]["calls"] > 0
+        assert snapshot[phase]["nanoseconds"] > 0
+
+
+def test_nested_dealer_calls_are_timed_once():
+    simulator, profiler = profiled_simulator()
+    simulator.run(200)
+
+    # at most one dealer play per round, however many cards are drawn
+    assert profiler.calls["dealer"] <= 200
+
+
+def test_profiler_can_be_removed():
+    simulator, profiler = profiled_simulator()
+    table = simulator.get_table()
+    table.set_profiler(profiler)
+    table.set_profiler(None)
+
+    assert not any(name in table.__dict__ for names in PHASES.values() for name in names)
+    assert table.dealer_action.__func__ is Table.dealer_action
+
+    simulator.run(10)
+    assert profiler.calls["deal"] == 0
+
+
+def test_prometheus_text():
+    simulator, profiler = profiled_simulator()
+    simulator.run(10)
+    lines = profiler.prometheus().splitlines()
+
+    assert "# TYPE blackjack_table_phase_calls_total counter" in lines
+    assert 'blackjack_table_phase_calls_total{phase="deal"} 10' in lines
+    seconds = 'blackjack_table_phase_seconds_total{phase="dealer"}'
+    assert any(line.startswith(seconds) for line in lines)
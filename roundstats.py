@@ -0,0 +1,152 @@
+"""
+Statistics of the rounds played at a Table, kept in constant memory.
+
+RoundStats is an event log sink: set on a table with set_event_log it
+adds up the chips settled on each hand of a round and, when the round
+ends, folds the round's net into
+
+    a running mean and variance (Welford's algorithm)
+    a histogram of the hands' results and one of the rounds' nets
+    the running net chips, their peak and the deepest drawdown
+
+Nothing is kept per round, so billions of rounds take the same memory
+as ten. Stats gathered in separate processes merge into one as if
+their rounds had been played one after the other.
+
+    stats = RoundStats()
+    table.set_event_log(stats)
+    ...
+    print(stats.report())
+"""
+
+from math import sqrt
+
+from eventlog import NullEventLog
+
+# two sided 95% confidence
+Z_95 = 1.959964
+
+
+class RoundStats(NullEventLog):
+    """
+    Attributes:
+        rounds: rounds with at least one hand settled
+        mean: mean net chips per round
+        results: hands settled by result, "player", "bust" and so on
+        nets: rounds by net chips
+        net: net chips over every round
+        peak: the highest net chips reached, from 0
+        trough: the lowest net chips reached, from 0
+        max_drawdown: the largest fall of net chips from a peak
+    """
+
+    def __init__(self) -> None:
+        self.rounds = 0
+        self.mean = 0.0
+        # sum of squared differences from the mean
+        self._m2 = 0.0
+        self.results: dict[str, int] = {}
+        self.nets: dict[int, int] = {}
+        self.net = 0
+        self.peak = 0
+        self.trough = 0
+        self.max_drawdown = 0
+
+        self._round_net = 0
+        self._settled = False
+
+    def settle(self, hand: int, result: str, amount: int) -> None:
+        self.results[result] = self.results.get(result, 0) + 1
+        self._round_net += amount
+        self._settled = True
+
+    def end_round(self, chips: int) -> None:
+        if not self._settled:
+            return
+        self.add(self._round_net)
+        self._round_net = 0
+        self._settled = False
+
+    def add(self, net: int) -> None:
+        """folds in a round that won or lost net chips"""
+        self.rounds += 1
+        delta = net - self.mean
+        self.mean += delta / self.rounds
+        self._m2 += delta * (net - self.mean)
+
+        nets = self.nets
+        nets[net] = nets.get(net, 0) + 1
+
+        self.net += net
+        if self.net > self.peak:
+            self.peak = self.net
+        elif self.net < self.trough:
+            self.trough = self.net
+        drawdown = self.peak - self.net
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+
+    def merge(self, other: "RoundStats") -> None:
+        """
+        Adds the rounds of other to these stats,
+        as if other's rounds were played after these
+        """
+        if other.rounds == 0:
+            return
+
+        rounds = self.rounds + other.rounds
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.rounds * other.rounds / rounds
+        self.mean += delta * other.rounds / rounds
+        self.rounds = rounds
+
+        for result, count in other.results.items():
+            self.results[result] = self.results.get(result, 0) + count
+        for net, count in other.nets.items():
+            self.nets[net] = self.nets.get(net, 0) + count
+
+        # other's extremes are reached from this stats' net chips
+        self.max_drawdown = max(
+            self.max_drawdown,
+            other.max_drawdown,
+            self.peak - (self.net + other.trough),
+        )
+        self.peak = max(self.peak, self.net + other.peak)
+        self.trough = min(self.trough, self.net + other.trough)
+        self.net += other.net
+
+    def variance(self) -> float:
+        """Returns the sample variance of the net chips per round"""
+        if self.rounds < 2:
+            return 0.0
+        return self._m2 / (self.rounds - 1)
+
+    def std_dev(self) -> float:
+        return sqrt(self.variance())
+
+    def std_error(self) -> float:
+        """Returns the standard error of the mean"""
+        if self.rounds == 0:
+            return 0.0
+        return self.std_dev() / sqrt(self.rounds)
+
+    def confidence_interval(self, z: float = Z_95) -> tuple[float, float]:
+        """
+        Returns the (low, high) bounds of the mean net chips per round,
+        95% confidence unless another z score is given
+        """
+        margin = z * self.std_error()
+        return self.mean - margin, self.mean + margin
+
+    def report(self) -> str:
+        low, high = self.confidence_interval()
+        results = ", ".join(
+            f"{result}: {count}" for result, count in sorted(self.results.items())
+        )
+        return (
+            f"rounds: {self.rounds}\n"
+            f"mean net per round: {self.mean:.4f} (95% CI {low:.4f} to {high:.4f})\n"
+            f"std dev per round: {self.std_dev():.3f}\n"
+            f"net chips: {self.net} (peak {self.peak}, max drawdown {self.max_drawdown})\n"
+            f"hands: {results}"
+        )
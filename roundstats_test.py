@@ -0,0 +1,82 @@
+from statistics import mean, variance
+
+import pytest
+
+from eventlog import PLAYER_HAND, SPLIT_HAND
+from roundstats import RoundStats
+from simulator import BasicStrategy, Simulator
+
+NETS = [10, -10, -10, 15, 0, -20, -10, 20, 10, -5, -10, -10, 30]
+
+
+def stats_of(nets):
+    stats = RoundStats()
+    for net in nets:
+        stats.add(net)
+    return stats
+
+
+def test_mean_and_variance():
+    stats = stats_of(NETS)
+
+    assert stats.rounds == len(NETS)
+    assert stats.mean == pytest.approx(mean(NETS))
+    assert stats.variance() == pytest.approx(variance(NETS))
+    low, high = stats.confidence_interval()
+    assert low < stats.mean < high
+
+
+def test_drawdown():
+    stats = stats_of(NETS)
+
+    assert stats.net == sum(NETS)
+    assert stats.peak == 10
+    assert stats.trough == -25
+    # from 10 down to -25
+    assert stats.max_drawdown == 35
+
+
+def test_merge_matches_one_pass():
+    whole = stats_of(NETS)
+    for cut in range(len(NETS) + 1):
+        merged = stats_of(NETS[:cut])
+        merged.merge(stats_of(NETS[cut:]))
+
+        assert merged.rounds == whole.rounds
+        assert merged.mean == pytest.approx(whole.mean)
+        assert merged.variance() == pytest.approx(whole.variance())
+        assert merged.nets == whole.nets
+        assert (merged.net, merged.peak, merged.trough, merged.max_drawdown) == (
+            whole.net,
+            whole.peak,
+            whole.trough,
+            whole.max_drawdown,
+        )
+
+
+def test_settlements_are_added_up_per_round():
+    stats = RoundStats()
+    stats.settle(SPLIT_HAND, "player", 10)
+    stats.settle(SPLIT_HAND + 1, "bust", -10)
+    stats.settle(SPLIT_HAND + 2, "player", 20)
+    stats.end_round(520)
+    # a round with nothing settled is not counted
+    stats.end_round(520)
+    stats.settle(PLAYER_HAND, "blackjack", 15)
+    stats.end_round(535)
+
+    assert stats.rounds == 2
+    assert stats.nets == {20: 1, 15: 1}
+    assert stats.results == {"player": 2, "bust": 1, "blackjack": 1}
+
+
+def test_agrees_with_simulation_result():
+    stats = RoundStats()
+    simulator = Simulator(BasicStrategy(), seed=5)
+    simulator.get_table().set_event_log(stats)
+    result = simulator.run(3000)
+
+    assert stats.rounds == result.rounds
+    assert stats.net == result.net
+    assert stats.variance() == pytest.approx(result.variance())
+    assert stats.results["blackjack"] == result.blackjacks
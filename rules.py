@@ -0,0 +1,71 @@
+"""
+The rules a blackjack table is played by.
+
+A Rules object is frozen, so it can be shared by tables, used as a
+dictionary key and sent to worker processes. A Table reads the rules
+once when it is created and keeps what it needs in its own attributes.
+"""
+
+from dataclasses import dataclass, replace
+
+
+@dataclass(frozen=True)
+class Rules:
+    """
+    Attributes:
+        decks: number of decks in the shoe
+        hit_soft_17: the dealer hits a soft 17 instead of standing
+        double_after_split: split hands may double
+        surrender: the player may give up half the bet instead of
+            playing their first two cards
+        blackjack_payout: what a blackjack wins for each chip bet
+        max_split_hands: the most hands a pair can be split into,
+            1 for no splitting
+        split_aces_one_card: split aces get one card each and
+            can not be split again
+    """
+
+    decks: int = 6
+    hit_soft_17: bool = False
+    double_after_split: bool = True
+    surrender: bool = False
+    blackjack_payout: float = 1.5
+    max_split_hands: int = 4
+    split_aces_one_card: bool = True
+
+    def __post_init__(self) -> None:
+        if self.decks < 1:
+            raise ValueError(f"Invalid number of decks: {self.decks}")
+        if self.max_split_hands < 1:
+            raise ValueError(f"Invalid max split hands: {self.max_split_hands}")
+
+    def name(self) -> str:
+        """a short description like 6D S17 DAS 3:2"""
+        parts = [
+            f"{self.decks}D",
+            "H17" if self.hit_soft_17 else "S17",
+            "DAS" if self.double_after_split else "NDAS",
+        ]
+        if self.surrender:
+            parts.append("SUR")
+        if self.blackjack_payout == 1.5:
+            parts.append("3:2")
+        elif self.blackjack_payout == 1.2:
+            parts.append("6:5")
+        else:
+            parts.append(f"BJ{self.blackjack_payout:g}")
+        return " ".join(parts)
+
+
+DEFAULT_RULES = Rules()
+
+# common rule sets, played side by side by simulator --sweep
+RULE_VARIANTS = (
+    DEFAULT_RULES,
+    replace(DEFAULT_RULES, hit_soft_17=True),
+    replace(DEFAULT_RULES, double_after_split=False),
+    replace(DEFAULT_RULES, surrender=True),
+    replace(DEFAULT_RULES, blackjack_payout=1.2),
+    replace(DEFAULT_RULES, decks=1),
+    replace(DEFAULT_RULES, decks=2, hit_soft_17=True),
+)
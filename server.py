@@ -0,0 +1,283 @@
+"""
+Serves blackjack over a line based protocol with asyncio.
+
+Every connection plays its own Table. Each command line gets exactly
+one reply line.
+
+    BET <chips>                 starts a round
+    HIT / STAND / DOUBLE / SPLIT / SURRENDER
+    CHIPS                       the player's chips
+    PLAYER <name>               plays as a player saved in the bankroll store
+    QUIT
+
+Replies:
+    CARDS hand=<n> cards=<cards> value=<n> dealer=<up card>
+    DONE <results> chips=<n> dealer=<cards> value=<n>
+    CHIPS <n>
+    ERR <reason>
+    BYE
+"""
+
+import asyncio
+from functools import partial
+
+from bankroll import BankrollStore
+from blackjack import Hand, Table, create_game
+from shoepool import ShoePool
+
+ACTIONS = {
+    "HIT": "hit",
+    "STAND": "stand",
+    "DOUBLE": "double",
+    "SPLIT": "split",
+    "SURRENDER": "surrender",
+}
+
+
+def format_cards(entity: Hand) -> str:
+    return ",".join(map(repr, entity.get_cards()))
+
+
+class Session:
+    """
+    The state of one connection, without any I/O.
+    handle takes a command line and returns the reply line.
+    """
+
+    def __init__(
+        self,
+        game: Table,
+        store: BankrollStore | None = None,
+        pool: ShoePool | None = None,
+    ) -> None:
+        self.game = game
+        self.store = store
+        self.pool = pool
+        self.splits: list[Hand] = []
+        self.split_index = 0
+        self.playing = False
+
+    def handle(self, line: str) -> str:
+        command, _, argument = line.strip().partition(" ")
+        command = command.upper()
+
+        if command == "BET":
+            return self.bet(argument)
+        elif command in ACTIONS:
+            if not self.playing:
+                return "ERR no round in play"
+            if self.splits:
+                return self.split_action(ACTIONS[command])
+            return self.player_action(ACTIONS[command])
+        elif command == "CHIPS":
+            return f"CHIPS {self.game.get_player().get_chips()}"
+        elif command == "PLAYER":
+            return self.load_player(argument)
+        elif command == "QUIT":
+            return "BYE"
+        return "ERR unknown command"
+
+    def bet(self, argument: str) -> str:
+        if self.playing:
+            return "ERR round in play"
+        try:
+            bet = int(argument)
+        except ValueError:
+            return "ERR invalid bet"
+        if bet <= 0:
+            return "ERR invalid bet"
+        if not self.game.player_bets(bet):
+            return "ERR not enough chips"
+
+        self.playing = True
+        if self.game.initial_deal() == "blackjack":
+            self.game.dealer_action()
+            if self.game.get_dealer().blackjack_check():
+                return self.finish(["tied"], self.game.push)
+            return self.finish(["blackjack"], self.game.player_blackjack_win)
+
+        return self.cards(self.game.get_player(), 0)
+
+    def load_player(self, name: str) -> str:
+        """sits the named player at a new table with their saved chips"""
+        if self.store is None:
+            return "ERR no bankroll store"
+        if self.playing:
+            return "ERR round in play"
+        if not name:
+            return "ERR invalid name"
+
+        self.game = create_game(store=self.store, name=name, pool=self.pool)
+        return f"CHIPS {self.game.get_player().get_chips()}"
+
+    def player_action(self, action: str) -> str:
+        game = self.game
+        action_result = game.player_action(action)
+
+        if action_result == "invalid":
+            return "ERR invalid action"
+        elif action_result is None:
+            return self.cards(game.get_player(), 0)
+        elif action_result == "bust":
+            return self.finish(["bust"], game.player_lose)
+        elif action_result == "split":
+            self.splits = game.create_split()
+            self.split_index = -1
+            return self.next_split()
+        elif action_result == "surrender":
+            return self.finish(["surrender"], game.player_surrender)
+
+        dealer_result = game.dealer_action()
+        if dealer_result == "compare":
+            dealer_result = game.compare_cards()
+
+        if dealer_result == "player":
+            return self.finish(["player"], game.player_win)
+        elif dealer_result == "dealer":
+            return self.finish(["dealer"], game.player_lose)
+        return self.finish(["tied"], game.push)
+
+    def split_action(self, action: str) -> str:
+        split = self.splits[self.split_index]
+        action_result = self.game.split_action(split, action)
+
+        if action_result == "invalid":
+            return "ERR invalid action"
+        elif action_result is None or action_result == "split":
+            return self.cards(split, self.split_index + 1)
+        return self.next_split()
+
+    def next_split(self) -> str:
+        """moves on to the next split that can still be played"""
+        self.split_index += 1
+        while self.split_index < len(self.splits):
+            split = self.splits[self.split_index]
+            if not split.is_finished():
+                return self.cards(split, self.split_index + 1)
+            self.split_index += 1
+
+        game = self.game
+        game.split_dealer_action()
+        results = game.settle_splits()
+        self.splits = []
+        return self.finish(results, game.reset_table)
+
+    def cards(self, hand: Hand, number: int) -> str:
+        dealer_card = self.game.get_dealer().get_cards()[0]
+        return (
+            f"CARDS hand={number} cards={format_cards(hand)} "
+            f"value={hand.get_card_values()} dealer={dealer_card!r}"
+        )
+
+    def finish(self, results: list[str], settle) -> str:
+        """settles the round, the dealer's cards are read before the table is reset"""
+        dealer = self.game.get_dealer()
+        dealer_cards = format_cards(dealer)
+        dealer_value = dealer.get_card_values()
+
+        settle()
+        self.playing = False
+        return (
+            f"DONE {','.join(results)} chips={self.game.get_player().get_chips()} "
+            f"dealer={dealer_cards} value={dealer_value}"
+        )
+
+
+async def _skip_line(reader: asyncio.StreamReader) -> None:
+    """drops the rest of a line longer than the reader's limit"""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as error:
+            await reader.readexactly(error.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    store: BankrollStore | None = None,
+    pool: ShoePool | None = None,
+) -> None:
+    session = Session(create_game(pool=pool), store, pool)
+    try:
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as error:
+                # the connection closed, maybe after a last unterminated line
+                line = error.partial
+                if not line:
+                    break
+            except asyncio.LimitOverrunError:
+                await _skip_line(reader)
+                line = None
+
+            if line is None:
+                reply = "ERR line too long"
+            else:
+                try:
+                    reply = session.handle(line.decode(errors="replace"))
+                except Exception:
+                    # keeps the one reply per line promise for commands
+                    # Session does not expect
+                    reply = "ERR invalid command"
+            writer.write(reply.encode() + b"\n")
+            if reply == "BYE":
+                break
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        if store is not None:
+            store.flush()
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 7777,
+    store: BankrollStore | None = None,
+    pool: ShoePool | None = None,
+) -> None:
+    """
+    Args:
+        store: keeps the players' chips, see the PLAYER command
+        pool: shuffles every connection's shoes off the event loop
+    """
+    handler = partial(handle_connection, store=store, pool=pool)
+    # a large backlog so bursts of new connections are not refused
+    server = await asyncio.start_server(handler, host, port, backlog=4096)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve blackjack over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--db", help="a SQLite file to keep players' chips in")
+    parser.add_argument(
+        "--shoe-pool",
+        type=int,
+        default=0,
+        metavar="SIZE",
+        help="shoes to keep shuffled ahead on a background thread",
+    )
+    args = parser.parse_args()
+
+    store = BankrollStore(args.db) if args.db else None
+    pool = ShoePool(size=args.shoe_pool) if args.shoe_pool > 0 else None
+    try:
+        asyncio.run(serve(args.host, args.port, store, pool))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store is not None:
+            store.close()
+        if pool is not None:
+            pool.close()
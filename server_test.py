@@ -0,0 +1,109 @@
+import asyncio
+
+from blackjack import BlackJackDeck, Player, Table
+from cards import Card
+from loadgen import run
+from server import Session, handle_connection
+
+
+class FixedDeck(BlackJackDeck):
+    def __init__(self, cards: list[Card]) -> None:
+        self.cards = cards
+
+
+def session_with(values: list[int]) -> Session:
+    deck = FixedDeck([Card(value, "") for value in values])
+    return Session(Table(Player([], "Player"), Player([], "Dealer"), deck))
+
+
+def test_session_plays_a_round():
+    # player 10, 6 against dealer 9, 8
+    session = session_with([10, 9, 6, 8, 3])
+
+    assert session.handle("HIT") == "ERR no round in play"
+    assert session.handle("BET 100") == "CARDS hand=0 cards=10,6 value=16 dealer=9"
+    assert session.handle("hit") == "CARDS hand=0 cards=10,6,3 value=19 dealer=9"
+    assert session.handle("STAND") == "DONE player chips=600 dealer=9,8 value=17"
+    assert session.handle("CHIPS") == "CHIPS 600"
+
+
+def test_session_bets():
+    session = session_with([10, 9, 6, 8])
+
+    assert session.handle("BET 1000") == "ERR not enough chips"
+    assert session.handle("BET ten") == "ERR invalid bet"
+    assert session.handle("BET ²") == "ERR invalid bet"
+    assert session.handle("BET -10") == "ERR invalid bet"
+    assert session.handle("BET 0") == "ERR invalid bet"
+    session.handle("BET 10")
+    assert session.handle("BET 10") == "ERR round in play"
+
+
+def test_session_splits():
+    # player 8, 8 against dealer 10, 7, each split is dealt a 10
+    session = session_with([8, 10, 8, 7, 10, 10])
+
+    assert session.handle("BET 50").startswith("CARDS hand=0")
+    assert session.handle("SPLIT") == "CARDS hand=1 cards=8,10 value=18 dealer=10"
+    assert session.handle("STAND") == "CARDS hand=2 cards=8,10 value=18 dealer=10"
+    assert session.handle("STAND") == "DONE player,player chips=600 dealer=10,7 value=17"
+
+
+def test_session_resplits():
+    # player 8, 8 against dealer 10, 7, the first split is dealt another 8
+    session = session_with([8, 10, 8, 7, 8, 10, 10, 10])
+
+    session.handle("BET 50")
+    assert session.handle("SPLIT") == "CARDS hand=1 cards=8,8 value=16 dealer=10"
+    assert session.handle("SPLIT") == "CARDS hand=1 cards=8,10 value=18 dealer=10"
+    assert session.handle("STAND") == "CARDS hand=2 cards=8,10 value=18 dealer=10"
+    session.handle("STAND")
+    assert session.handle("STAND") == "DONE player,player,player chips=650 dealer=10,7 value=17"
+
+
+def test_server_with_load_generator():
+    async def main():
+        server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await run("127.0.0.1", port, connections=20, rounds=5)
+
+    latencies = asyncio.run(main())
+    assert len(latencies) >= 20 * 6
+
+
+def test_server_replies_to_bad_lines():
+    async def main():
+        server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"\xff\xfe\n" + b"B" * 200_000 + b"\nCHIPS\nQUIT\n")
+            replies = [await reader.readline() for _ in range(4)]
+            writer.close()
+            return replies
+
+    assert asyncio.run(main()) == [
+        b"ERR unknown command\n",
+        b"ERR line too long\n",
+        b"CHIPS 500\n",
+        b"BYE\n",
+    ]
+
+
+def test_server_replies_when_a_command_fails(monkeypatch):
+    def fail(session, line):
+        raise ValueError(line)
+
+    async def main():
+        server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"CHIPS\n")
+            reply = await reader.readline()
+            writer.close()
+            return reply
+
+    monkeypatch.setattr(Session, "handle", fail)
+    assert asyncio.run(main()) == b"ERR invalid command\n"
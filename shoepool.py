@@ -0,0 +1,83 @@
+"""
+A pool of shoes shuffled ahead of time on a background thread.
+
+A shoe is a list of the interned cards of cards.CARDS in dealing
+order, so building one creates no Card objects, only 8 byte
+references. A deck drawing from a pool reshuffles by taking the next
+shoe from the pool in place of its card list, which costs the same
+however many decks are in the shoe. When the pool is empty the deck
+shuffles in place as it would without one, so a burst of reshuffles
+never waits on the worker.
+
+    pool = ShoePool(decks=6)
+    deck = BlackJackDeck(pool=pool)
+    ...
+    pool.close()
+
+The worker shuffles with its own generator, so a seeded pool hands
+out the same shoes in the same order every run. Which reshuffles get
+them, and which shuffle in place, depends on how far ahead it is.
+"""
+
+import queue
+import threading
+from random import Random
+
+from cards import STANDARD_DECK, Card
+
+
+class ShoePool:
+    def __init__(self, decks: int = 6, size: int = 4, seed: int | str | None = None) -> None:
+        """
+        Args:
+            decks: decks in each shoe
+            size: shoes kept shuffled and waiting
+            seed: seeds the shuffles, random if not given
+        """
+        self.decks = decks
+        self.misses = 0
+
+        self._rng = Random(seed)
+        self._shoes: queue.Queue[list[Card]] = queue.Queue(maxsize=size)
+        self._closed = threading.Event()
+        self._worker = threading.Thread(target=self._fill, name="shoe-pool", daemon=True)
+        self._worker.start()
+
+    def _fill(self) -> None:
+        """shuffles shoes until the pool is closed, waiting while it is full"""
+        while not self._closed.is_set():
+            shoe = list(STANDARD_DECK) * self.decks
+            self._rng.shuffle(shoe)
+
+            while not self._closed.is_set():
+                try:
+                    self._shoes.put(shoe, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def get_shoe(self) -> list[Card] | None:
+        """
+        Returns the next shuffled shoe, which belongs to the caller,
+        or None without waiting if the pool has run dry or is closed.
+        The caller is to shuffle its own shoe then.
+        """
+        try:
+            return self._shoes.get_nowait()
+        except queue.Empty:
+            self.misses += 1
+            return None
+
+    def ready(self) -> int:
+        """the number of shoes waiting in the pool"""
+        return self._shoes.qsize()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._worker.join()
+
+    def __enter__(self) -> "ShoePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
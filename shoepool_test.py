@@ -0,0 +1,122 @@
+import time
+from collections import Counter
+
+import pytest
+
+from blackjack import BlackJackDeck, create_game
+from cards import STANDARD_DECK, Deck
+from rules import Rules
+from shoepool import ShoePool
+
+
+def filled(pool: ShoePool, shoes: int) -> ShoePool:
+    """waits for the worker to have shoes ready"""
+    for _ in range(500):
+        if pool.ready() >= shoes:
+            return pool
+        time.sleep(0.01)
+    raise AssertionError("the pool did not fill")
+
+
+def test_shoes_are_full_shuffled_shoes():
+    with ShoePool(decks=2, size=2, seed=1) as pool:
+        filled(pool, 2)
+        first = pool.get_shoe()
+        second = pool.get_shoe()
+
+    assert len(first) == 104
+    assert Counter(first) == Counter(STANDARD_DECK * 2)
+    assert first != second
+    assert first is not second
+
+
+def test_seeded_pools_deal_the_same_shoes():
+    with ShoePool(size=6, seed=7) as pool, ShoePool(size=6, seed=7) as other:
+        filled(pool, 6)
+        filled(other, 6)
+        assert [pool.get_shoe() for _ in range(6)] == [
+            other.get_shoe() for _ in range(6)
+        ]
+
+
+def test_pool_fills_up_to_its_size():
+    with ShoePool(decks=1, size=3) as pool:
+        filled(pool, 3)
+        pool.get_shoe()
+        filled(pool, 3)
+        time.sleep(0.05)
+        assert pool.ready() == 3
+
+
+def test_closed_pool():
+    pool = ShoePool(decks=1, size=1)
+    pool.close()
+
+    assert not pool._worker.is_alive()
+    while pool.ready():
+        pool.get_shoe()
+    assert pool.get_shoe() is None
+
+
+def test_empty_pool_shuffles_in_place():
+    pool = ShoePool(decks=1, size=1)
+    pool.close()
+    while pool.ready():
+        pool.get_shoe()
+    misses = pool.misses
+
+    # a closed pool never fills, so these return only if nothing waits on it
+    deck = BlackJackDeck(pool=pool)
+    cards = deck.cards
+    assert Counter(cards) == Counter(STANDARD_DECK)
+
+    deck.draw_card()
+    deck.reshuffle()
+    assert deck.cards is cards
+    assert deck.cards_drawn() == 0
+    assert pool.misses == misses + 2
+
+
+def test_reshuffle_swaps_in_the_next_shoe():
+    with ShoePool(decks=1, size=2, seed=3) as pool:
+        deck = BlackJackDeck(pool=pool, penetration=0.5)
+        first = deck.cards
+        while not deck.needs_reshuffle():
+            deck.draw_card()
+
+        filled(pool, 1)
+        deck.reshuffle()
+
+    assert deck.cards is not first
+    assert len(deck.cards) == 52
+    assert deck.cards_drawn() == 0
+    assert deck.running_count() == 0
+
+
+def test_reshuffle_after_snapshot_keeps_the_snapshot():
+    with ShoePool(decks=1, size=2, seed=3) as pool:
+        deck = BlackJackDeck(pool=pool)
+        deck.draw_card()
+        cards, cursor, count = deck.snapshot()
+        saved = list(cards)
+
+        filled(pool, 1)
+        deck.reshuffle()
+        deck.draw_card()
+
+    assert cards == saved
+    deck.restore((cards, cursor, count))
+    assert deck.cards_drawn() == 1
+
+
+def test_pool_must_match_the_deck():
+    deck = Deck()
+    deck.add_64_cards()
+    with ShoePool(decks=2, size=1) as pool:
+        with pytest.raises(ValueError):
+            deck.set_shoe_pool(pool)
+        with pytest.raises(ValueError):
+            create_game(Rules(decks=6), pool=pool)
+
+        game = create_game(Rules(decks=2), pool=pool)
+        assert len(game.get_deck().cards) == 104
@@ -0,0 +1,425 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from random import Random
+
+from blackjack import BlackJackDeck, Hand, Player, Table
+from cards import Card
+from outcomes import BLACKJACK, Outcome
+from rules import DEFAULT_RULES, RULE_VARIANTS, Rules
+
+
+class Strategy:
+    """
+    Decides the player's action for a hand.
+    Subclasses override decide.
+    """
+
+    def decide(self, hand: Hand, dealer_card: Card, can_split: bool) -> str:
+        """
+        Returns one of "hit", "stand", "double", "split", "surrender"
+
+        Args:
+            hand: the hand being played (player or split)
+            dealer_card: the dealer's face up card
+            can_split: True if the hand may be split
+        """
+        raise NotImplementedError
+
+    def fallback(self, hand: Hand, dealer_card: Card, can_split: bool, action: str) -> str:
+        """
+        Returns the action to play when the table refuses the double or
+        surrender decide returned for the same arguments, hit unless
+        overridden
+        """
+        return "hit"
+
+
+class DealerStrategy(Strategy):
+    """Mimics the dealer: hits below 17, never doubles or splits"""
+
+    def decide(self, hand: Hand, dealer_card: Card, can_split: bool) -> str:
+        if hand.get_card_values() < 17:
+            return "hit"
+        return "stand"
+
+
+class BasicStrategy(Strategy):
+    """
+    A simplified basic strategy for a 6 deck shoe
+    where the dealer stands on all 17s.
+    """
+
+    def decide(self, hand: Hand, dealer_card: Card, can_split: bool) -> str:
+        cards = hand.get_cards()
+        up = dealer_card.points
+        if up == 1:
+            up = 11
+        total = hand.get_card_values()
+        two_cards = len(cards) == 2
+
+        if can_split and two_cards:
+            pair = cards[0].points
+            if pair == 1 or pair == 8:
+                return "split"
+            if pair in (2, 3, 7) and up <= 7:
+                return "split"
+            if pair == 6 and up <= 6:
+                return "split"
+            if pair == 9 and up not in (7, 10, 11):
+                return "split"
+
+        if hand.is_soft():
+            if total >= 19:
+                return "stand"
+            if total == 18:
+                if two_cards and 3 <= up <= 6:
+                    return "double"
+                return "stand" if up <= 8 else "hit"
+            if two_cards and 13 <= total <= 17 and 5 <= up <= 6:
+                return "double"
+            return "hit"
+
+        if total >= 17:
+            return "stand"
+        if total >= 13:
+            return "stand" if up <= 6 else "hit"
+        if total == 12:
+            return "stand" if 4 <= up <= 6 else "hit"
+        if two_cards and total == 11:
+            return "double"
+        if two_cards and total == 10 and up <= 9:
+            return "double"
+        if two_cards and total == 9 and 3 <= up <= 6:
+            return "double"
+        return "hit"
+
+    def fallback(self, hand: Hand, dealer_card: Card, can_split: bool, action: str) -> str:
+        # soft 18 doubles or stands, every other double hits
+        if hand.is_soft() and hand.get_card_values() >= 18:
+            return "stand"
+        return "hit"
+
+
+class SimulationResult:
+    """
+    Collects the outcome of simulated rounds
+
+    Attributes:
+        rounds: number of rounds played
+        wagered: total of the initial bets
+        net: chips won (positive) or lost (negative) by the player
+        wins, losses, pushes, blackjacks: outcome counts per round
+        trajectory: the player's net chips sampled every few rounds
+    """
+
+    def __init__(self) -> None:
+        self.rounds = 0
+        self.wagered = 0
+        self.net = 0
+        self.net_squared = 0
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+        self.blackjacks = 0
+        self.trajectory: list[int] = []
+
+    def merge(self, other: "SimulationResult") -> None:
+        """
+        Adds the results of other to this result.
+        other's trajectory is continued from this result's net chips
+        """
+        self.trajectory.extend(self.net + net for net in other.trajectory)
+
+        self.rounds += other.rounds
+        self.wagered += other.wagered
+        self.net += other.net
+        self.net_squared += other.net_squared
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.blackjacks += other.blackjacks
+
+    def house_edge(self) -> float:
+        """Returns the house edge as a fraction of the initial bets"""
+        if self.wagered == 0:
+            return 0.0
+        return -self.net / self.wagered
+
+    def variance(self) -> float:
+        """Returns the variance of the net chips per round"""
+        if self.rounds < 2:
+            return 0.0
+        mean = self.net / self.rounds
+        return (self.net_squared - self.rounds * mean * mean) / (self.rounds - 1)
+
+    def std_dev(self) -> float:
+        return sqrt(self.variance())
+
+    def report(self) -> str:
+        return (
+            f"rounds: {self.rounds}\n"
+            f"net chips: {self.net}\n"
+            f"house edge: {self.house_edge() * 100:.3f}%\n"
+            f"std dev per round: {self.std_dev():.3f}\n"
+            f"wins/losses/pushes: {self.wins}/{self.losses}/{self.pushes}\n"
+            f"blackjacks: {self.blackjacks}"
+        )
+
+
+class Simulator:
+    """
+    Plays rounds of blackjack on a Table without any user input.
+
+    The player's decisions are made by the given strategy,
+    the shoe is reshuffled by the table when the cut card comes out.
+    The table is played by the given rules.
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        bet: int = 10,
+        bankroll: int = 1_000_000,
+        sample_every: int = 1000,
+        seed: int | str | None = None,
+        rules: Rules = DEFAULT_RULES,
+    ) -> None:
+        """
+        Args:
+            seed: seeds the shuffles so runs can be repeated,
+                the global random state is used if not given
+        """
+        self._strategy = strategy
+        self._bet = bet
+        self._sample_every = sample_every
+        self._rng = None if seed is None else Random(seed)
+
+        player = Player([], "Player", bankroll)
+        dealer = Player([], "Dealer")
+        deck = BlackJackDeck(self._rng, decks=rules.decks)
+        self._table = Table(player, dealer, deck, rules)
+
+    def get_table(self) -> Table:
+        return self._table
+
+    def run(self, rounds: int) -> SimulationResult:
+        """Plays the given number of rounds and returns the results"""
+        result = SimulationResult()
+        table = self._table
+        player = table.get_player()
+        start_chips = player.get_chips()
+
+        for i in range(rounds):
+            chips = player.get_chips()
+            if not table.player_bets(self._bet):
+                break
+
+            outcome = self.play_round()
+            net = player.get_chips() - chips
+
+            result.rounds += 1
+            result.wagered += self._bet
+            result.net += net
+            result.net_squared += net * net
+            if outcome is BLACKJACK:
+                result.blackjacks += 1
+            if net > 0:
+                result.wins += 1
+            elif net < 0:
+                result.losses += 1
+            else:
+                result.pushes += 1
+
+            if i % self._sample_every == 0:
+                result.trajectory.append(player.get_chips() - start_chips)
+
+        return result
+
+    def play_round(self) -> Outcome:
+        """
+        Plays one round with the bet already placed.
+
+        Returns:
+            BLACKJACK, SPLIT, SURRENDER or the final Outcome of the hand
+        """
+        return self._table.play_round(self._strategy)
+
+    def play_splits(self) -> None:
+        self._table.play_splits(self._strategy)
+
+CHUNK_ROUNDS = 10_000
+
+
+def _run_chunk(
+    strategy: Strategy,
+    bet: int,
+    seed: int,
+    chunk: int,
+    rounds: int,
+    rules: Rules = DEFAULT_RULES,
+) -> SimulationResult:
+    simulator = Simulator(strategy, bet, seed=f"{seed}-{chunk}", rules=rules)
+    return simulator.run(rounds)
+
+
+def _chunk_sizes(rounds: int, chunk_rounds: int) -> list[int]:
+    chunks = range((rounds + chunk_rounds - 1) // chunk_rounds)
+    return [min(chunk_rounds, rounds - chunk * chunk_rounds) for chunk in chunks]
+
+
+def run_parallel(
+    strategy: Strategy,
+    rounds: int,
+    bet: int = 10,
+    seed: int = 0,
+    workers: int | None = None,
+    chunk_rounds: int = CHUNK_ROUNDS,
+    rules: Rules = DEFAULT_RULES,
+) -> SimulationResult:
+    """
+    Spreads the rounds over a pool of processes and merges the results.
+
+    The rounds are cut into chunks of chunk_rounds, each played from a
+    fresh shoe and bankroll with its own generator seeded from seed and
+    the chunk number. Chunks are merged in order, so the result only
+    depends on seed and chunk_rounds, never on the number of workers.
+
+    Args:
+        strategy: must be picklable to reach the worker processes
+        workers: number of processes, defaults to the cpu count
+    """
+    sizes = _chunk_sizes(rounds, chunk_rounds)
+    args = (
+        [strategy] * len(sizes),
+        [bet] * len(sizes),
+        [seed] * len(sizes),
+        range(len(sizes)),
+        sizes,
+        [rules] * len(sizes),
+    )
+
+    if workers == 1:
+        results = map(_run_chunk, *args)
+        return _merge_results(results)
+
+    with ProcessPoolExecutor(workers) as pool:
+        return _merge_results(pool.map(_run_chunk, *args))
+
+
+def run_sweep(
+    strategy: Strategy,
+    rounds: int,
+    variants: tuple[Rules, ...] = RULE_VARIANTS,
+    bet: int = 10,
+    seed: int = 0,
+    workers: int | None = None,
+    chunk_rounds: int = CHUNK_ROUNDS,
+) -> dict[Rules, SimulationResult]:
+    """
+    Plays the rounds under every rule set in one pool of processes.
+
+    Each rule set is played as run_parallel would play it, with the
+    same seeds, so variants with the same number of decks are dealt
+    the same shoes and their differences are not blurred by luck.
+    """
+    sizes = _chunk_sizes(rounds, chunk_rounds)
+    count = len(sizes) * len(variants)
+    args = (
+        [strategy] * count,
+        [bet] * count,
+        [seed] * count,
+        [*range(len(sizes))] * len(variants),
+        sizes * len(variants),
+        [rules for rules in variants for _ in sizes],
+    )
+
+    if workers == 1:
+        results = list(map(_run_chunk, *args))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_run_chunk, *args))
+
+    return {
+        rules: _merge_results(results[i * len(sizes) : (i + 1) * len(sizes)])
+        for i, rules in enumerate(variants)
+    }
+
+
+def _merge_results(results) -> SimulationResult:
+    merged = SimulationResult()
+    for result in results:
+        merged.merge(result)
+    return merged
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Simulate rounds of blackjack")
+    parser.add_argument("rounds", type=int, nargs="?", default=100_000)
+    parser.add_argument("--bet", type=int, default=10)
+    parser.add_argument("--dealer-strategy", action="store_true")
+    parser.add_argument("--strategy-csv", help="a strategy table to play")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--sweep", action="store_true", help="play every rule variant")
+    parser.add_argument(
+        "--profile", action="store_true", help="time the phases of the rounds in process"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="gather streaming statistics of the rounds in process",
+    )
+    args = parser.parse_args()
+
+    if args.strategy_csv:
+        from compiled_strategy import CompiledStrategy
+
+        strategy = CompiledStrategy.from_csv(args.strategy_csv)
+    elif args.dealer_strategy:
+        strategy = DealerStrategy()
+    else:
+        strategy = BasicStrategy()
+
+    start = time.perf_counter()
+    if args.profile:
+        from profiling import PhaseProfiler
+
+        profiler = PhaseProfiler()
+        simulator = Simulator(strategy, args.bet, seed=args.seed)
+        simulator.get_table().set_profiler(profiler)
+        result = simulator.run(args.rounds)
+        elapsed = time.perf_counter() - start
+
+        print(result.report())
+        print(profiler.prometheus(), end="")
+        rounds = result.rounds
+    elif args.stats:
+        from roundstats import RoundStats
+
+        stats = RoundStats()
+        simulator = Simulator(strategy, args.bet, seed=args.seed)
+        simulator.get_table().set_event_log(stats)
+        simulator.run(args.rounds)
+        elapsed = time.perf_counter() - start
+
+        print(stats.report())
+        rounds = stats.rounds
+    elif args.sweep:
+        results = run_sweep(
+            strategy, args.rounds, bet=args.bet, seed=args.seed, workers=args.workers
+        )
+        elapsed = time.perf_counter() - start
+
+        for rules, result in results.items():
+            print(f"{rules.name():<24} house edge: {result.house_edge() * 100:.3f}%")
+        rounds = sum(result.rounds for result in results.values())
+    else:
+        result = run_parallel(strategy, args.rounds, args.bet, args.seed, args.workers)
+        elapsed = time.perf_counter() - start
+
+        print(result.report())
+        rounds = result.rounds
+    print(f"{rounds / elapsed:,.0f} rounds/s")
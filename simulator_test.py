@@ -0,0 +1,98 @@
+from blackjack import Player
+from cards import Card
+from simulator import (
+    BasicStrategy,
+    DealerStrategy,
+    SimulationResult,
+    Simulator,
+    run_parallel,
+    run_sweep,
+)
+from outcomes import Outcome
+from rules import Rules
+
+
+def test_simulator_counts_every_round():
+    simulator = Simulator(BasicStrategy(), bet=10)
+    result = simulator.run(2000)
+
+    assert result.rounds == 2000
+    assert result.wagered == 20000
+    assert result.wins + result.losses + result.pushes == 2000
+    assert result.net == simulator.get_table().get_player().get_chips() - 1_000_000
+
+
+def test_simulator_leaves_table_clean():
+    simulator = Simulator(DealerStrategy())
+    simulator.run(500)
+
+    table = simulator.get_table()
+    assert table.get_player().get_cards() == []
+    assert table.get_dealer().get_cards() == []
+    assert table.get_player().get_bet() == 0
+
+
+def test_basic_strategy_splits_aces():
+    hand = Player([Card(1, ""), Card(1, "")])
+    assert BasicStrategy().decide(hand, Card(10, ""), True) == "split"
+    assert BasicStrategy().decide(hand, Card(10, ""), False) == "hit"
+
+
+def test_result_variance():
+    result = SimulationResult()
+    for net in [10, -10, 10, -10]:
+        result.rounds += 1
+        result.net += net
+        result.net_squared += net * net
+
+    assert result.variance() == 400 / 3
+
+
+def test_seeded_simulator_repeats():
+    first = Simulator(BasicStrategy(), seed=7).run(1000)
+    second = Simulator(BasicStrategy(), seed=7).run(1000)
+
+    assert first.net == second.net
+    assert first.trajectory == second.trajectory
+
+
+def test_parallel_results_do_not_depend_on_workers():
+    single = run_parallel(BasicStrategy(), 3000, seed=3, workers=1, chunk_rounds=1000)
+    pooled = run_parallel(BasicStrategy(), 3000, seed=3, workers=2, chunk_rounds=1000)
+
+    assert single.rounds == pooled.rounds == 3000
+    assert vars(single) == vars(pooled)
+
+
+def test_sweep_plays_every_variant():
+    variants = (Rules(), Rules(blackjack_payout=1.2))
+    results = run_sweep(BasicStrategy(), 2000, variants, seed=5, workers=1)
+
+    assert list(results) == list(variants)
+    base, six_to_five = results.values()
+    assert base.rounds == six_to_five.rounds == 2000
+    # the same shoes are dealt, only blackjacks are paid less
+    assert base.blackjacks == six_to_five.blackjacks
+    assert base.net - six_to_five.net == base.blackjacks * 3
+
+
+def test_play_rounds_matches_simulator():
+    strategy = BasicStrategy()
+    simulated = Simulator(strategy, seed=9).run(3000)
+
+    table = Simulator(strategy, seed=9).get_table()
+    results = table.play_rounds(3000, strategy, 10)
+
+    assert sum(results.net) == simulated.net
+    assert results.outcomes.count(Outcome.BLACKJACK) == simulated.blackjacks
+
+
+def test_house_edge_is_about_right():
+    # 6 decks, S17, DAS, 3:2: basic strategy gives up about half a
+    # percent, mimicking the dealer about five and a half. The bands
+    # are several standard errors wide for 200k rounds.
+    basic = Simulator(BasicStrategy(), seed=1).run(200_000)
+    assert 0.0 < basic.house_edge() < 0.012
+
+    dealer = Simulator(DealerStrategy(), seed=1).run(200_000)
+    assert 0.04 < dealer.house_edge() < 0.07
@@ -0,0 +1,473 @@
+"""
+Exact composition dependent strategy for the rules played by Table.
+
+A shoe composition is a tuple of 10 counts, the number of cards left
+of each blackjack value: index 0 holds the aces, index 9 every ten
+valued card. Cards are referred to by their points (1 - 10).
+
+The rules follow Table, played by a rules.Rules:
+    the dealer does not peek for blackjack,
+    a dealer blackjack beats a player 21 of more cards
+    the dealer stands or hits soft 17 as the rules say
+    doubling takes one card for twice the bet
+    split hands are dealt a second card and may double if the rules
+    allow it, split aces get one card each if the rules say so
+    surrender, where allowed, loses half the bet
+    (re-splitting is not valued, a pair is split at most once)
+
+The dealer's odds are worked out with numpy for every composition the
+player can reach from a hand at once, which is what keeps a full
+table down to seconds.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterator
+
+import numpy as np
+
+from rules import DEFAULT_RULES, Rules
+
+
+def shoe_composition(decks: int) -> tuple[int, ...]:
+    """Returns the composition of a full shoe of the given number of decks"""
+    return (4 * decks,) * 9 + (16 * decks,)
+
+
+SIX_DECK_SHOE = shoe_composition(6)
+
+# dealer outcomes, in the order the distributions are returned
+DEALER_TOTALS = (17, 18, 19, 20, 21)
+BUST = 5
+
+
+def remove_card(composition: tuple[int, ...], points: int) -> tuple[int, ...]:
+    """Returns the composition with one card of the given points removed"""
+    index = points - 1
+    if composition[index] == 0:
+        raise ValueError(f"no card worth {points} left in the shoe")
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1 :]
+
+
+def hand_total(hard: int, aces: bool) -> int:
+    if aces and hard <= 11:
+        return hard + 10
+    return hard
+
+
+@lru_cache(maxsize=None)
+def _dealer_graph(
+    up_card: int, hit_soft_17: bool = False
+) -> list[tuple[int, list[tuple[int, int, int]]]]:
+    """
+    Returns every multiset of cards the dealer can draw after up_card
+    before standing, in the order they are reached.
+
+    Each state is (cards drawn, transitions) and each transition is
+    (card index, copies of the card already drawn, next state),
+    the next state being -1 - outcome when the dealer stands or busts.
+    """
+    start = (0,) * 10
+    index = {start: 0}
+    order = [start]
+    graph = []
+
+    # order grows while it is walked, a breadth first search
+    for drawn in order:
+        hard = up_card + sum((i + 1) * count for i, count in enumerate(drawn))
+        aces = up_card == 1 or drawn[0] > 0
+
+        transitions = []
+        for i in range(10):
+            total = hand_total(hard + i + 1, aces or i == 0)
+            soft_17 = total == 17 and hard + i + 1 == 7
+            if total > 21:
+                target = -1 - BUST
+            elif total >= 17 and not (hit_soft_17 and soft_17):
+                target = -1 - (total - 17)
+            else:
+                next_drawn = drawn[:i] + (drawn[i] + 1,) + drawn[i + 1 :]
+                target = index.get(next_drawn)
+                if target is None:
+                    target = index[next_drawn] = len(order)
+                    order.append(next_drawn)
+            transitions.append((i, drawn[i], target))
+
+        graph.append((sum(drawn), transitions))
+
+    return graph
+
+
+def dealer_distributions(
+    compositions: list[tuple[int, ...]], up_card: int, hit_soft_17: bool = False
+) -> np.ndarray:
+    """
+    Returns an array of shape (len(compositions), 6) with the chance
+    of the dealer finishing on 17, 18, 19, 20, 21 and bust
+    when drawing from each composition after showing up_card
+    """
+    counts = np.array(compositions, dtype=float).T
+    cards_left = counts.sum(axis=0)
+
+    graph = _dealer_graph(up_card, hit_soft_17)
+    reached: list[np.ndarray | None] = [None] * len(graph)
+    reached[0] = np.ones(len(compositions))
+    outcomes = np.zeros((6, len(compositions)))
+    available = {}
+
+    for state, (drawn, transitions) in enumerate(graph):
+        chance = reached[state] / np.maximum(cards_left - drawn, 1)
+        reached[state] = None
+
+        for i, used, target in transitions:
+            copies = available.get((i, used))
+            if copies is None:
+                copies = available[i, used] = np.maximum(counts[i] - used, 0)
+
+            step = chance * copies
+            if target < 0:
+                outcomes[-1 - target] += step
+            elif reached[target] is None:
+                reached[target] = step
+            else:
+                reached[target] += step
+
+    return outcomes.T
+
+
+def natural_chance(composition: tuple[int, ...], up_card: int) -> float:
+    """
+    Returns the chance of the dealer's hole card making a blackjack
+    with up_card, the part of the dealer's 21 in dealer_distributions
+    that is a natural
+    """
+    if up_card == 1:
+        hole = 9
+    elif up_card == 10:
+        hole = 0
+    else:
+        return 0.0
+    cards_left = sum(composition)
+    return composition[hole] / cards_left if cards_left else 0.0
+
+
+def _removals(
+    composition: tuple[int, ...], budget: int, index: int = 0
+) -> Iterator[tuple[int, ...]]:
+    """
+    Yields the composition left after removing each multiset of cards
+    whose points add up to at most budget
+    """
+    if index == 10:
+        yield composition
+        return
+
+    points = index + 1
+    most = min(composition[index], budget // points)
+    for copies in range(most + 1):
+        removed = (
+            composition[:index]
+            + (composition[index] - copies,)
+            + composition[index + 1 :]
+        )
+        yield from _removals(removed, budget - copies * points, index + 1)
+
+
+class Solver:
+    """
+    Computes exact expected values of the player's actions.
+
+    Every recursion is memoized on the shoe composition in bounded
+    LRU caches, shared by all the hands solved by this object.
+    """
+
+    def __init__(self, cache_size: int = 1 << 20, rules: Rules = DEFAULT_RULES) -> None:
+        """
+        Args:
+            cache_size: maximum entries kept by each cache
+            rules: the rules the hands are played by
+        """
+        self._rules = rules
+        self._hit_soft_17 = rules.hit_soft_17
+        self._double_after_split = rules.double_after_split
+        self._split_aces_one_card = rules.split_aces_one_card
+        self._surrender = rules.surrender
+        self._can_split = rules.max_split_hands >= 2
+
+        self._cache_size = cache_size
+        self._dealer_cache: OrderedDict = OrderedDict()
+
+        cache = lru_cache(maxsize=cache_size)
+        self._stand = cache(self._stand_ev)
+        self._best = cache(self._best_ev)
+
+    def get_rules(self) -> Rules:
+        return self._rules
+
+    def clear_cache(self) -> None:
+        self._dealer_cache.clear()
+        self._stand.cache_clear()
+        self._best.cache_clear()
+
+    def _store_dealer(self, key: tuple, outcomes: tuple[float, ...]) -> None:
+        self._dealer_cache[key] = outcomes
+        if len(self._dealer_cache) > self._cache_size:
+            self._dealer_cache.popitem(last=False)
+
+    def prefetch(self, composition: tuple[int, ...], up_card: int, budget: int = 21) -> None:
+        """
+        Works out the dealer's odds in one batch for every composition
+        left after the player draws cards worth at most budget
+        """
+        missing = [
+            removed
+            for removed in _removals(composition, budget)
+            if (removed, up_card) not in self._dealer_cache
+        ]
+        if not missing:
+            return
+
+        rows = dealer_distributions(missing, up_card, self._hit_soft_17)
+        for removed, outcomes in zip(missing, rows.tolist()):
+            self._store_dealer((removed, up_card), tuple(outcomes))
+
+    def dealer_distribution(
+        self, composition: tuple[int, ...], up_card: int
+    ) -> tuple[float, ...]:
+        """
+        Returns the probabilities of the dealer finishing on
+        17, 18, 19, 20, 21 and bust, drawing from composition
+        after showing up_card
+        """
+        key = (composition, up_card)
+        outcomes = self._dealer_cache.get(key)
+        if outcomes is None:
+            outcomes = tuple(
+                dealer_distributions([composition], up_card, self._hit_soft_17)[0].tolist()
+            )
+            self._store_dealer(key, outcomes)
+        else:
+            self._dealer_cache.move_to_end(key)
+        return outcomes
+
+    def _stand_ev(self, composition: tuple[int, ...], total: int, up_card: int) -> float:
+        if total > 21:
+            return -1.0
+
+        outcomes = self.dealer_distribution(composition, up_card)
+        ev = outcomes[BUST]
+        for dealer_total, p in zip(DEALER_TOTALS, outcomes):
+            if total > dealer_total:
+                ev += p
+            elif total < dealer_total:
+                ev -= p
+        if total == 21:
+            # the dealer's naturals win instead of tying, see Table.compare
+            ev -= natural_chance(composition, up_card)
+        return ev
+
+    def _hit_ev(
+        self, composition: tuple[int, ...], hard: int, aces: bool, up_card: int
+    ) -> float:
+        cards_left = sum(composition)
+        ev = 0.0
+        for index, count in enumerate(composition):
+            if count == 0:
+                continue
+            points = index + 1
+            if hard + points > 21:
+                ev -= count / cards_left
+                continue
+            ev += (count / cards_left) * self._best(
+                remove_card(composition, points),
+                hard + points,
+                aces or points == 1,
+                up_card,
+            )
+        return ev
+
+    def _best_ev(
+        self, composition: tuple[int, ...], hard: int, aces: bool, up_card: int
+    ) -> float:
+        """the value of a hand played on with hit or stand"""
+        stand = self._stand(composition, hand_total(hard, aces), up_card)
+        if hand_total(hard, aces) == 21:
+            return stand
+        return max(stand, self._hit_ev(composition, hard, aces, up_card))
+
+    def _double_ev(
+        self, composition: tuple[int, ...], hard: int, aces: bool, up_card: int
+    ) -> float:
+        cards_left = sum(composition)
+        ev = 0.0
+        for index, count in enumerate(composition):
+            if count == 0:
+                continue
+            points = index + 1
+            total = hand_total(hard + points, aces or points == 1)
+            stand = self._stand(remove_card(composition, points), total, up_card)
+            ev += (count / cards_left) * 2 * stand
+        return ev
+
+    def _split_ev(self, composition: tuple[int, ...], points: int, up_card: int) -> float:
+        """
+        Two hands each starting from one of the pair.
+        The second card of each hand is drawn from the same
+        composition, the cards of the other hand are not removed.
+        """
+        cards_left = sum(composition)
+        ev = 0.0
+        for index, count in enumerate(composition):
+            if count == 0:
+                continue
+            second = index + 1
+            after = remove_card(composition, second)
+            hard = points + second
+            aces = points == 1 or second == 1
+            if points == 1 and self._split_aces_one_card:
+                hand_ev = self._stand(after, hand_total(hard, aces), up_card)
+            elif self._double_after_split:
+                hand_ev = max(
+                    self._best(after, hard, aces, up_card),
+                    self._double_ev(after, hard, aces, up_card),
+                )
+            else:
+                hand_ev = self._best(after, hard, aces, up_card)
+            ev += (count / cards_left) * hand_ev
+        return 2 * ev
+
+    def hand_evs(
+        self, composition: tuple[int, ...], cards: tuple[int, ...], up_card: int
+    ) -> dict[str, float]:
+        """
+        Returns the expected value of each action for the hand.
+        Split is only included for pairs, surrender for two card
+        hands when the rules allow it.
+
+        Args:
+            composition: the shoe before the hand's cards and
+                the up card were dealt
+            cards: points of the player's cards
+            up_card: points of the dealer's up card
+        """
+        composition = remove_card(composition, up_card)
+        for points in cards:
+            composition = remove_card(composition, points)
+
+        hard = sum(cards)
+        aces = 1 in cards
+        self.prefetch(composition, up_card, 21 - hard)
+
+        evs = {
+            "hit": self._hit_ev(composition, hard, aces, up_card),
+            "stand": self._stand(composition, hand_total(hard, aces), up_card),
+            "double": self._double_ev(composition, hard, aces, up_card),
+        }
+        if self._can_split and len(cards) == 2 and cards[0] == cards[1]:
+            self.prefetch(composition, up_card, 21 - cards[0])
+            evs["split"] = self._split_ev(composition, cards[0], up_card)
+        if len(cards) == 2 and self._surrender:
+            evs["surrender"] = -0.5
+
+        return evs
+
+    def best_action(
+        self, composition: tuple[int, ...], cards: tuple[int, ...], up_card: int
+    ) -> str:
+        evs = self.hand_evs(composition, cards, up_card)
+        return max(evs, key=evs.__getitem__)
+
+    def strategy_table(
+        self, composition: tuple[int, ...] | None = None
+    ) -> dict[tuple[str, int, int], str]:
+        """
+        Returns the best action for two card hands against every up card,
+        from a full shoe of the rules' decks if no composition is given.
+
+        Keys are (kind, total, up card) where kind is "hard", "soft"
+        or "pair", total is the hand's value, or the pair card's points
+        for pairs, and the up card is its points.
+        """
+        if composition is None:
+            composition = shoe_composition(self._rules.decks)
+
+        table = {}
+        for up_card in range(1, 11):
+            # covers every hand that does not split
+            self.prefetch(remove_card(composition, up_card), up_card)
+            for kind, total, cards in starting_hands():
+                table[kind, total, up_card] = self.best_action(
+                    composition, cards, up_card
+                )
+        return table
+
+
+def strategy_csv(solver: Solver, composition: tuple[int, ...] | None = None) -> str:
+    """
+    Returns the best two card strategy in the CSV format read by
+    compiled_strategy, doubles and surrenders fall back to the better
+    of hit or stand
+    """
+    if composition is None:
+        composition = shoe_composition(solver.get_rules().decks)
+
+    up_cards = [*range(2, 11), 1]
+    lines = ["hand," + ",".join(str(up) if up != 1 else "A" for up in up_cards)]
+
+    for kind, total, cards in starting_hands():
+        cells = []
+        for up_card in up_cards:
+            evs = solver.hand_evs(composition, cards, up_card)
+            action = max(evs, key=evs.__getitem__)
+            if action == "double":
+                cells.append("D" if evs["hit"] > evs["stand"] else "Ds")
+            elif action == "surrender":
+                cells.append("Rh" if evs["hit"] > evs["stand"] else "Rs")
+            else:
+                cells.append({"hit": "H", "stand": "S", "split": "P"}[action])
+
+        if kind == "pair":
+            label = "PA" if total == 1 else f"P{total}"
+        else:
+            label = f"{kind[0].upper()}{total}"
+        lines.append(label + "," + ",".join(cells))
+
+    return "\n".join(lines) + "\n"
+
+
+def starting_hands() -> list[tuple[str, int, tuple[int, int]]]:
+    """
+    Returns a two card hand for every row of a strategy table
+    as (kind, total, cards)
+    """
+    hands = []
+    for total in range(5, 21):
+        # 20 can only be made with a pair of tens
+        first = 10 if total >= 12 else 2
+        hands.append(("hard", total, (first, total - first)))
+    for total in range(13, 21):
+        hands.append(("soft", total, (1, total - 11)))
+    for points in range(1, 11):
+        hands.append(("pair", points, (points, points)))
+    return hands
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    rules = Rules(hit_soft_17="--h17" in sys.argv, surrender="--surrender" in sys.argv)
+
+    if "--csv" in sys.argv:
+        print(strategy_csv(Solver(rules=rules)), end="")
+        sys.exit()
+
+    start = time.perf_counter()
+    strategy = Solver(rules=rules).strategy_table()
+    print(f"solved in {time.perf_counter() - start:.1f}s\n")
+
+    symbols = {"hit": "H", "stand": "S", "double": "D", "split": "P", "surrender": "R"}
+    print("      " + " ".join(f"{up:>2}" for up in [*range(2, 11), "A"]))
+    for kind, total, _ in starting_hands():
+        row = [symbols[strategy[kind, total, up]] for up in [*range(2, 11), 1]]
+        print(f"{kind[0].upper()}{total:<4} " + " ".join(f"{a:>2}" for a in row))
@@ -0,0 +1,103 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from rules import Rules
+from solver import BUST, SIX_DECK_SHOE, Solver, natural_chance, remove_card
+
+
+def brute_force_dealer(composition, hard, aces):
+    total = hard + 10 if aces and hard <= 11 else hard
+    if total > 21:
+        return {"bust": 1.0}
+    if total >= 17:
+        return {total: 1.0}
+
+    outcomes = {}
+    cards_left = sum(composition)
+    for index, count in enumerate(composition):
+        if count == 0:
+            continue
+        points = index + 1
+        after = brute_force_dealer(
+            remove_card(composition, points), hard + points, aces or points == 1
+        )
+        for outcome, p in after.items():
+            outcomes[outcome] = outcomes.get(outcome, 0) + p * count / cards_left
+    return outcomes
+
+
+def test_dealer_distribution_matches_brute_force():
+    composition = (2, 1, 1, 1, 2, 1, 1, 1, 1, 4)
+    solver = Solver()
+    for up_card in range(1, 11):
+        if composition[up_card - 1] == 0:
+            continue
+        after = remove_card(composition, up_card)
+        expected = brute_force_dealer(after, up_card, up_card == 1)
+
+        outcomes = solver.dealer_distribution(after, up_card)
+        for outcome, p in zip([17, 18, 19, 20, 21, "bust"], outcomes):
+            assert p == pytest.approx(expected.get(outcome, 0))
+
+
+def test_dealer_bust_chance_against_six():
+    solver = Solver()
+    outcomes = solver.dealer_distribution(remove_card(SIX_DECK_SHOE, 6), 6)
+
+    assert sum(outcomes) == pytest.approx(1)
+    assert outcomes[-1] == pytest.approx(0.4228, abs=1e-4)
+
+
+def test_strategy_table_well_known_plays():
+    table = Solver().strategy_table()
+
+    assert table["hard", 16, 10] == "hit"
+    assert table["hard", 13, 2] == "stand"
+    assert table["hard", 11, 6] == "double"
+    assert table["soft", 18, 9] == "hit"
+    assert table["pair", 8, 7] == "split"
+    assert table["pair", 10, 6] == "stand"
+
+
+def test_bounded_cache():
+    solver = Solver(cache_size=16)
+    solver.hand_evs(SIX_DECK_SHOE, (10, 6), 10)
+
+    assert len(solver._dealer_cache) <= 16
+
+
+def test_rules_change_the_solution():
+    evs = Solver().hand_evs(SIX_DECK_SHOE, (10, 6), 10)
+    assert "surrender" not in evs
+
+    solver = Solver(rules=Rules(surrender=True))
+    assert solver.best_action(SIX_DECK_SHOE, (10, 6), 10) == "surrender"
+
+    # the dealer busts more often hitting soft 17 against an ace
+    stands = Solver().dealer_distribution(remove_card(SIX_DECK_SHOE, 1), 1)
+    hits = Solver(rules=Rules(hit_soft_17=True)).dealer_distribution(
+        remove_card(SIX_DECK_SHOE, 1), 1
+    )
+    assert hits[-1] > stands[-1]
+
+    evs = Solver(rules=Rules(max_split_hands=1)).hand_evs(SIX_DECK_SHOE, (8, 8), 10)
+    assert "split" not in evs
+
+
+def test_dealer_natural_beats_player_21():
+    solver = Solver()
+    after = remove_card(SIX_DECK_SHOE, 1)
+    for _ in range(3):
+        after = remove_card(after, 7)
+
+    outcomes = solver.dealer_distribution(after, 1)
+    natural = natural_chance(after, 1)
+    assert natural == pytest.approx(96 / 308)
+
+    # 7, 7, 7 ties a drawn 21 and loses to the natural
+    ev = solver.hand_evs(SIX_DECK_SHOE, (7, 7, 7), 1)["stand"]
+    assert ev == pytest.approx(sum(outcomes[:4]) + outcomes[BUST] - natural)
+
+    # no naturals behind a 6
+    assert natural_chance(after, 6) == 0.0